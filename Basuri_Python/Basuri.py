@@ -1,70 +1,127 @@
 import sys
-import sounddevice as sd
 import numpy as np
-import threading
 from PyQt5.QtWidgets import QApplication, QWidget
-from PyQt5.QtGui import QPainter, QColor
-from PyQt5.QtCore import Qt, QTimer
-
-NOTES_FREQ = {
-    'C4': 261.63, 'C#4': 277.18, 'D4': 293.66, 'D#4': 311.13, 'E4': 329.63,
-    'F4': 349.23, 'F#4': 369.99, 'G4': 392.00, 'G#4': 415.30, 'A4': 440.00,
-    'A#4': 466.16, 'B4': 493.88, 'C5': 523.25
-}
-NOTE_ORDER = ['C4', 'C#4', 'D4', 'D#4', 'E4', 'F4', 'F#4', 'G4', 'G#4', 'A4', 'A#4', 'B4', 'C5']
-
-def freq_to_note(freq):
-    print(f"Detected frequency: {freq:.2f} Hz")
-    min_diff = float('inf')
-    closest_note = None
-    for note, note_freq in NOTES_FREQ.items():
-        diff = abs(freq - note_freq)
-        if diff < min_diff:
-            min_diff = diff
-            closest_note = note
-    return closest_note
+from PyQt5.QtGui import QPainter, QColor, QPixmap
+from PyQt5.QtCore import Qt, QRect, QRectF, pyqtSignal
+from BasuriNotes import NOTE_ORDER
+from BasuriPitch import make_detector, GatedDetector
+from BasuriCapture import AudioCapture, AnalysisWorker
+from BasuriSegment import NoteSegmenter
+
 
 class BasuriGUI(QWidget):
-    def __init__(self):
+    # Emitted from the analysis thread; Qt queues it onto the GUI thread
+    note_changed = pyqtSignal(str)
+
+    spacing = 70
+    radius = 30
+    x = 100
+
+    def __init__(self, engine='fft', decimate=1, source='mic', stream_factory=None):
         super().__init__()
         self.setWindowTitle("Basuri Note Recognizer")
         self.setGeometry(100, 100, 200, 500)
         self.active_note = None
+        self.detected_note = None  # last note seen by the analysis thread
         self.listening = True
-        self.timer = QTimer()
-        self.timer.timeout.connect(self.update)
-        self.timer.start(100)
-        threading.Thread(target=self.listen_mic, daemon=True).start()
+        self.source = source  # 'mic', or 'shared' to read the BasuriShared.py capture daemon
+        self.decimate = decimate  # analyse at 44.1 kHz / decimate
+        self.fs = 44100 // decimate
+        self.stream_factory = stream_factory  # None opens the microphone; see BasuriReplay for recordings
+        # 'fft', 'yin', 'acf' or 'goertzel' (note bank); silent blocks are skipped, fast passages get half a block
+        self.detector = GatedDetector(make_detector(engine), min_size=512 // decimate)
+        self.segmenter = NoteSegmenter()  # debounces frames into played notes
+        self.background = self.render_ladder()
+        self.active_color = QColor('green')
+        self.note_changed.connect(self.set_active_note)
+        self.listen_mic()
+
+    def note_center(self, note):
+        return self.x, 50 + NOTE_ORDER.index(note) * self.spacing
+
+    def note_rect(self, note):
+        x, y = self.note_center(note)
+        return QRect(x - self.radius - 1, y - self.radius - 1, self.radius * 2 + 2, self.radius * 2 + 2)
+
+    def draw_note(self, qp, note, color):
+        x, y = self.note_center(note)
+        qp.setBrush(color)
+        qp.setPen(Qt.black)
+        qp.drawEllipse(x - self.radius, y - self.radius, self.radius * 2, self.radius * 2)
+        qp.drawText(x - 10, y + 5, note)
+
+    def render_ladder(self):
+        # The idle note ladder never changes, so paint it once into a pixmap at the screen's pixel density
+        ratio = self.devicePixelRatioF()
+        pixmap = QPixmap(round(200 * ratio), round((50 + len(NOTE_ORDER) * self.spacing) * ratio))
+        pixmap.setDevicePixelRatio(ratio)
+        pixmap.fill(self.palette().color(self.backgroundRole()))
+        qp = QPainter(pixmap)
+        gray = QColor('gray')
+        for note in NOTE_ORDER:
+            self.draw_note(qp, note, gray)
+        qp.end()
+        return pixmap
+
+    def set_active_note(self, note):
+        if note == self.active_note:
+            return
+        # Only the old and the new circle need repainting
+        if self.active_note in NOTE_ORDER:
+            self.update(self.note_rect(self.active_note))
+        self.active_note = note
+        if note in NOTE_ORDER:
+            self.update(self.note_rect(note))
 
     def paintEvent(self, event):
+        ratio = self.devicePixelRatioF()
+        if self.background.devicePixelRatio() != ratio:
+            self.background = self.render_ladder()  # moved to a screen of another density
         qp = QPainter(self)
-        spacing = 70
-        radius = 30
-        for i, note in enumerate(NOTE_ORDER):
-            x = 100
-            y = 50 + i * spacing
-            color = QColor('green') if note == self.active_note else QColor('gray')
-            qp.setBrush(color)
-            qp.setPen(Qt.black)
-            qp.drawEllipse(x - radius, y - radius, radius * 2, radius * 2)
-            qp.setPen(Qt.black)
-            qp.drawText(x - 10, y + 5, note)
+        rect = event.rect()
+        # The source rectangle is in pixmap pixels, the target in widget coordinates
+        source = QRectF(rect.x() * ratio, rect.y() * ratio, rect.width() * ratio, rect.height() * ratio)
+        qp.drawPixmap(QRectF(rect), self.background, source)
+        if self.active_note in NOTE_ORDER and rect.intersects(self.note_rect(self.active_note)):
+            self.draw_note(qp, self.active_note, self.active_color)
 
     def listen_mic(self):
-        def callback(indata, frames, time, status):
-            if not self.listening:
-                return
-            audio = indata[:, 0]
-            fft = np.fft.rfft(audio)
-            freqs = np.fft.rfftfreq(len(audio), 1/44100)
-            idx = np.argmax(np.abs(fft))
-            freq = freqs[idx]
-            note = freq_to_note(freq)
-            if note and note != self.active_note:
-                self.active_note = note
-        with sd.InputStream(channels=1, callback=callback, samplerate=44100, blocksize=2048):
-            while self.listening:
-                sd.sleep(100)
+        if self.source == 'shared':
+            # Another process owns the microphone and has already run the detector
+            from BasuriShared import SharedWorker  # multiprocessing is only worth importing here
+            self.capture = None
+            self.worker = SharedWorker(self.analyse_shared)
+            self.worker.start()
+            return
+        # The PortAudio callback only fills the ring; detection runs on the worker thread.
+        self.capture = AudioCapture(fs=44100, blocksize=1024, stream_factory=self.stream_factory).start()
+        self.worker = AnalysisWorker(self.capture, 1024 // self.decimate, self.analyse, decimate=self.decimate)
+        self.worker.start()
+
+    def analyse(self, frame, timestamp):
+        if not self.listening:
+            return
+        freq, _ = self.detector.detect(frame[0], self.fs)
+        level = np.sqrt(np.mean(np.square(frame[0])))
+        self.show_pitch(timestamp, freq, level, self.detector.magnitude)
+
+    def analyse_shared(self, record):
+        if self.listening:
+            self.show_pitch(float(record['time']), record['frequency'][0], record['level'][0], record['magnitude'][0])
+
+    def show_pitch(self, timestamp, freq, level, magnitude):
+        self.segmenter.push(timestamp, freq, level, magnitude)
+        note = self.segmenter.active
+        if note and note != self.detected_note:
+            self.detected_note = note
+            self.note_changed.emit(note)
+
+    def closeEvent(self, event):
+        self.listening = False
+        self.worker.stop()
+        if self.capture is not None:
+            self.capture.stop()
+        super().closeEvent(event)
 
 if __name__ == "__main__":
     app = QApplication(sys.argv)
@@ -0,0 +1,184 @@
+"""
+Speed and accuracy benchmark for the Basuri detection paths.
+
+    python BasuriBench.py
+    python BasuriBench.py --engines fft yin --blocks 512 1024 2048 --csv bench.csv
+    python BasuriBench.py --gated  # energy gate and adaptive window in front of each engine
+    python BasuriBench.py --decimate 4 --blocks 256 512  # analyse at 11.025 kHz
+
+Synthetic flute-like tones (harmonics, breath noise, vibrato, glides) are
+generated at every note in NOTES_FREQ, cut into blocks the way the live
+callbacks receive them, and pushed through the detection code of Basuri.py,
+BasuriPlotter.py and BasuriDetector.py. Each (path, engine, block size) row
+reports frames per second, per-frame latency percentiles, note accuracy and
+the median absolute pitch error in cents.
+"""
+import argparse
+import csv
+import os
+import sys
+import time
+from types import SimpleNamespace
+
+import numpy as np
+
+from BasuriDecimate import Decimator
+from BasuriNotes import NOTES_FREQ, freq_to_note_name
+from BasuriPitch import DETECTORS, GatedDetector, make_detector
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'MacOSProjects', 'PythonProjects'))
+
+# name -> (harmonic amplitudes, breath noise level, vibrato depth in cents, glide start in semitones)
+SCENARIOS = {
+    'steady': ((1.0, 0.5, 0.25, 0.12), 0.01, 0, 0),
+    'vibrato': ((1.0, 0.5, 0.25, 0.12), 0.02, 25, 0),
+    'breathy': ((0.5, 1.0, 0.4, 0.2), 0.15, 10, 0),  # weak fundamental, strong 2nd harmonic
+    'glide': ((1.0, 0.5, 0.25, 0.12), 0.02, 0, -2),  # meend from two semitones below
+}
+
+
+def flute_tone(freq, fs, seconds, harmonics=(1.0, 0.5, 0.25, 0.12), breath=0.02,
+               vibrato_cents=0, vibrato_hz=5.5, glide_semitones=0, glide_seconds=0.3, seed=0):
+    """
+    Synthetic bansuri-like tone.
+
+    Returns:
+        tuple: (signal, instantaneous fundamental in Hz), both float arrays of
+        seconds * fs samples.
+    """
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(seconds * fs)) / fs
+    cents = vibrato_cents * np.sin(2 * np.pi * vibrato_hz * t)
+    if glide_semitones:
+        cents = cents + 100 * glide_semitones * np.clip(1 - t / glide_seconds, 0, 1)
+    f0 = freq * 2 ** (cents / 1200)
+    phase = 2 * np.pi * np.cumsum(f0) / fs
+    signal = sum(a * np.sin(k * phase) for k, a in enumerate(harmonics, 1))
+    # Breath: noise shaped by a short moving average, so it is mostly below ~4 kHz
+    noise = np.convolve(rng.standard_normal(len(t)), np.ones(8) / 8, mode='same')
+    signal = 0.3 * (signal / sum(harmonics) + breath * noise / noise.std())
+    return signal.astype(np.float32), f0
+
+
+def gui_path(detector):
+    """Basuri.py: BasuriGUI.analyse on a stand-in for the widget."""
+    from Basuri import BasuriGUI
+    from BasuriSegment import NoteSegmenter
+    gui = SimpleNamespace(listening=True, detected_note=None, detector=detector,
+                          segmenter=NoteSegmenter(), note_changed=SimpleNamespace(emit=lambda note: None))
+
+    gui.show_pitch = lambda *args: BasuriGUI.show_pitch(gui, *args)
+
+    def run(block, fs):
+        gui.fs = fs
+        BasuriGUI.analyse(gui, block[None, :], 0.0)
+        return gui.detected_note, None
+    return run
+
+
+def plotter_path(detector):
+    """BasuriPlotter.py: detect_frequency, as called from analyse_frame."""
+    import BasuriPlotter
+    BasuriPlotter.detector = detector
+
+    def run(block, fs):
+        freq, _ = BasuriPlotter.detect_frequency(block, fs)
+        return None, freq
+    return run
+
+
+def detector_path(detector):
+    """BasuriDetector.py: detect_note."""
+    import BasuriDetector
+    BasuriDetector.detector = detector
+
+    def run(block, fs):
+        return BasuriDetector.detect_note(block, fs)
+    return run
+
+
+PATHS = {'gui': gui_path, 'plotter': plotter_path, 'detector': detector_path}
+
+
+def run_path(run, signals, fs, block):
+    """Feed every signal block by block through run(); returns latencies and errors."""
+    latencies, cents_errors, note_hits, note_total = [], [], 0, 0
+    for signal, f0 in signals:
+        for start in range(0, len(signal) - block + 1, block):
+            audio = signal[start:start + block]
+            t0 = time.perf_counter()
+            note, freq = run(audio, fs)
+            latencies.append(time.perf_counter() - t0)
+
+            truth = f0[start + block // 2]
+            if freq is not None:
+                cents_errors.append(abs(1200 * np.log2(max(float(freq), 1e-6) / truth)))
+                note = freq_to_note_name(freq)
+            note_hits += note == freq_to_note_name(truth)
+            note_total += 1
+    latencies = np.array(latencies)
+    return {
+        'fps': len(latencies) / latencies.sum(),
+        'p50_ms': np.percentile(latencies, 50) * 1e3,
+        'p95_ms': np.percentile(latencies, 95) * 1e3,
+        'p99_ms': np.percentile(latencies, 99) * 1e3,
+        'note_acc': note_hits / note_total,
+        'cents_med': np.median(cents_errors) if cents_errors else float('nan'),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the Basuri pitch detection paths on synthetic tones.")
+    parser.add_argument('--paths', nargs='+', default=list(PATHS), choices=list(PATHS))
+    parser.add_argument('--engines', nargs='+', default=sorted(DETECTORS), choices=sorted(DETECTORS))
+    parser.add_argument('--blocks', nargs='+', type=int, default=[512, 1024, 2048, 4096])
+    parser.add_argument('--scenarios', nargs='+', default=list(SCENARIOS), choices=list(SCENARIOS))
+    parser.add_argument('--seconds', type=float, default=1.0, help="length of each test tone")
+    parser.add_argument('--fs', type=int, default=44100)
+    parser.add_argument('--decimate', type=int, default=1,
+                        help="low-pass and decimate the tones by this factor first; --blocks count decimated samples")
+    parser.add_argument('--gated', action='store_true', help="put a GatedDetector in front of each engine")
+    parser.add_argument('--csv', help="also write the results to this CSV file")
+    args = parser.parse_args(argv)
+
+    signals = {}
+    for scenario in args.scenarios:
+        harmonics, breath, vibrato, glide = SCENARIOS[scenario]
+        signals[scenario] = [flute_tone(freq, args.fs, args.seconds, harmonics, breath, vibrato,
+                                        glide_semitones=glide, seed=i)
+                             for i, freq in enumerate(NOTES_FREQ.values())]
+        if args.decimate > 1:
+            signals[scenario] = [(Decimator(args.decimate).process(signal), f0[::args.decimate])
+                                 for signal, f0 in signals[scenario]]
+    fs = args.fs // args.decimate
+
+    rows = []
+    header = f"{'path':9} {'engine':8} {'block':>5} {'scenario':8} {'fps':>8} {'p50 ms':>7} {'p95 ms':>7} " \
+             f"{'p99 ms':>7} {'note %':>6} {'cents':>6}"
+    print(header)
+    for path in args.paths:
+        for engine in args.engines:
+            try:
+                detector = make_detector(engine)
+                run = PATHS[path](GatedDetector(detector) if args.gated else detector)
+            except ImportError as e:
+                print(f"{path:9} skipped: {e}")
+                break
+            for block in args.blocks:
+                for scenario in args.scenarios:
+                    result = run_path(run, signals[scenario], fs, block)
+                    row = dict(path=path, engine=engine, block=block, scenario=scenario, **result)
+                    rows.append(row)
+                    print(f"{path:9} {engine:8} {block:5d} {scenario:8} {row['fps']:8.0f} {row['p50_ms']:7.3f} "
+                          f"{row['p95_ms']:7.3f} {row['p99_ms']:7.3f} {100 * row['note_acc']:6.1f} "
+                          f"{row['cents_med']:6.1f}")
+
+    if args.csv and rows:
+        with open(args.csv, 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+            writer.writeheader()
+            writer.writerows(rows)
+
+
+if __name__ == '__main__':
+    main()
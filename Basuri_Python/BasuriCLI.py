@@ -0,0 +1,88 @@
+"""
+One entry point for the Basuri tools.
+
+    python BasuriCLI.py console                  # notes in the terminal, starts fastest
+    python BasuriCLI.py console --mode frames --engine yin
+    python BasuriCLI.py plot --window 600 --session sessions/today
+    python BasuriCLI.py plot --replay sessions/today
+    python BasuriCLI.py gui
+    python BasuriCLI.py daemon                   # shared capture; add --source shared to the others
+
+Only the standard library is imported up front. Each subcommand imports what
+it needs when it runs: the console needs nothing beyond NumPy (and
+sounddevice once the microphone opens), matplotlib is loaded by `plot` and
+PyQt5 by `gui` only.
+"""
+import argparse
+import os
+import sys
+
+ENGINES = ['acf', 'fft', 'goertzel', 'yin']  # BasuriPitch.DETECTORS, without importing it
+
+
+def console(args):
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'MacOSProjects', 'PythonProjects'))
+    import BasuriDetector
+    BasuriDetector.configure(engine=args.engine, channels=args.channels, mode=args.mode, source=args.source,
+                             decimate=args.decimate)
+    BasuriDetector.main()
+
+
+def plot(args):
+    import BasuriPlotter
+    if args.replay:
+        BasuriPlotter.plot_session(args.replay)
+        return
+    BasuriPlotter.configure(engine=args.engine, window_size=args.window, session_dir=args.session,
+                            source=args.source, decimate=args.decimate)
+    BasuriPlotter.main()
+
+
+def gui(args):
+    from PyQt5.QtWidgets import QApplication
+    from Basuri import BasuriGUI
+    app = QApplication(sys.argv[:1])
+    window = BasuriGUI(engine=args.engine, decimate=args.decimate, source=args.source)
+    window.show()
+    sys.exit(app.exec_())
+
+
+def daemon(args):
+    from BasuriShared import CaptureDaemon
+    CaptureDaemon(args.engine, args.channels, decimate=args.decimate).run()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Basuri note detection: console, live plot, GUI or capture daemon.")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    def add(name, run, help):
+        sub = commands.add_parser(name, help=help)
+        sub.add_argument('--engine', default='fft', choices=ENGINES, help="pitch engine")
+        sub.add_argument('--decimate', type=int, default=1, help="analyse at 44.1 kHz / DECIMATE")
+        sub.set_defaults(run=run)
+        return sub
+
+    sub = add('console', console, "print detected notes (NumPy only)")
+    sub.add_argument('--channels', type=int, default=1)
+    sub.add_argument('--mode', default='events', choices=['events', 'frames'])
+    sub.add_argument('--source', default='mic', choices=['mic', 'shared'])
+
+    sub = add('plot', plot, "live frequency/amplitude plot (matplotlib)")
+    sub.add_argument('--window', type=float, default=60, help="seconds shown")
+    sub.add_argument('--session', help="also record the session into this directory")
+    sub.add_argument('--replay', metavar='DIR', help="show a recorded session instead of listening")
+    sub.add_argument('--source', default='mic', choices=['mic', 'shared'])
+
+    sub = add('gui', gui, "note ladder window (PyQt5)")
+    sub.add_argument('--source', default='mic', choices=['mic', 'shared'])
+
+    sub = add('daemon', daemon, "capture once into shared memory for the other views")
+    sub.add_argument('--channels', type=int, default=1)
+
+    args = parser.parse_args(argv)
+    args.run(args)
+
+
+if __name__ == '__main__':
+    main()
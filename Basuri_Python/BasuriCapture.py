@@ -0,0 +1,232 @@
+import threading
+import time
+from collections import deque
+
+import numpy as np
+
+from BasuriDecimate import Decimator
+
+
+class RingBuffer:
+    """
+    Preallocated single-producer / single-consumer sample ring.
+
+    The audio callback is the only writer and the analysis thread the only
+    reader. Each side owns one position counter and only publishes it after
+    its copy is done, so no lock is needed and the callback never allocates.
+    When the reader falls behind, whole incoming blocks are dropped and
+    counted in `overflows`; `dropped` counts their samples. Reads that find
+    too little data (the normal way a reader waits for the next block) count
+    `idle_polls`.
+
+    Positions count written samples only, so after a drop they no longer
+    match the time since the stream started. The writer notes every drop in
+    `gaps`, and the reader gets the samples missing before a position from
+    dropped_before().
+
+    Samples are stored channel-major, (channels, capacity): the transpose from
+    PortAudio's interleaved layout happens once in write(), and every frame read
+    out is a contiguous (channels, n) block that the detectors can analyse for
+    all channels in one batched FFT.
+    """
+
+    def __init__(self, capacity, channels=1, dtype=np.float32):
+        self.capacity = int(capacity)
+        self.channels = channels
+        self.buffer = np.zeros((channels, self.capacity), dtype=dtype)
+        self.write_pos = 0  # total samples written, owned by the producer
+        self.read_pos = 0   # total samples consumed, owned by the consumer
+        self.overflows = 0
+        self.dropped = 0
+        self.idle_polls = 0
+        self.gaps = deque()  # (write_pos, total dropped) per drop; appended by the writer, popped by the reader
+        self._dropped_before = 0
+
+    @property
+    def available(self):
+        return self.write_pos - self.read_pos
+
+    def write(self, block):
+        """Copy an interleaved (frames, channels) block in. Returns False if it was dropped."""
+        n = len(block)
+        if n > self.capacity - (self.write_pos - self.read_pos):
+            self.overflows += 1
+            self.dropped += n
+            self.gaps.append((self.write_pos, self.dropped))
+            return False
+        i = self.write_pos % self.capacity
+        first = min(n, self.capacity - i)
+        self.buffer[:, i:i + first] = block[:first].T
+        self.buffer[:, :n - first] = block[first:].T
+        self.write_pos += n
+        return True
+
+    def read(self, n, out=None, hop=None):
+        """
+        Copy the oldest n samples into out (allocated if None) and consume hop of them.
+
+        With hop < n consecutive reads return overlapping frames, which is how
+        the STFT stage gets several pitch updates per frame length; with hop > n
+        the samples between frames are skipped.
+
+        Returns:
+            array: (channels, n) frame, or None if fewer than max(n, hop) samples are buffered.
+        """
+        if self.write_pos - self.read_pos < (n if hop is None else max(n, hop)):
+            self.idle_polls += 1
+            return None
+        if out is None:
+            out = np.empty((self.channels, n), dtype=self.buffer.dtype)
+        i = self.read_pos % self.capacity
+        first = min(n, self.capacity - i)
+        out[:, :first] = self.buffer[:, i:i + first]
+        out[:, first:] = self.buffer[:, :n - first]
+        self.read_pos += n if hop is None else hop
+        return out
+
+    def dropped_before(self, position):
+        """
+        Samples dropped before the sample at position (reader side, positions must not decrease).
+
+        Add it to a position to get the sample's offset from the start of the stream.
+        """
+        gaps = self.gaps
+        while gaps and gaps[0][0] <= position:
+            self._dropped_before = gaps.popleft()[1]
+        return self._dropped_before
+
+
+class AudioCapture:
+    """
+    Microphone input whose callback does nothing but copy into a RingBuffer.
+
+    Parameters:
+        fs (int): Sampling rate.
+        blocksize (int): PortAudio block size.
+        channels (int): Number of input channels.
+        buffer_seconds (float): Ring capacity, i.e. how far analysis may lag.
+        device: sounddevice input device (default device if None).
+        stream_factory: Called like sounddevice.InputStream to open the stream;
+            sounddevice.InputStream if None (see BasuriReplay for a stand-in).
+    """
+
+    def __init__(self, fs=44100, blocksize=1024, channels=1, buffer_seconds=2.0, device=None, stream_factory=None):
+        self.fs = fs
+        self.blocksize = blocksize
+        self.channels = channels
+        self.device = device
+        self.stream_factory = stream_factory
+        self.ring = RingBuffer(max(int(fs * buffer_seconds), 2 * blocksize), channels)
+        self.input_overflows = 0  # reported by PortAudio itself
+        self.start_time = None
+        self.stream = None
+
+    def callback(self, indata, frames, time_info, status):
+        if status.input_overflow:
+            self.input_overflows += 1
+        self.ring.write(indata)
+
+    def start(self):
+        factory = self.stream_factory
+        if factory is None:
+            import sounddevice as sd
+            factory = sd.InputStream
+        self.stream = factory(samplerate=self.fs, blocksize=self.blocksize, channels=self.channels,
+                              device=self.device, callback=self.callback)
+        self.start_time = time.time()
+        self.stream.start()
+        return self
+
+    def stop(self):
+        if self.stream is not None:
+            self.stream.stop()
+            self.stream.close()
+            self.stream = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def stats(self):
+        return {
+            'input_overflows': self.input_overflows,
+            'overflows': self.ring.overflows,
+            'dropped_seconds': self.ring.dropped / self.fs,
+            'idle_polls': self.ring.idle_polls,
+            'buffered': self.ring.available,
+        }
+
+
+class AnalysisWorker(threading.Thread):
+    """
+    Pulls fixed-size frames out of a capture ring and hands them to `analyse`.
+
+    analyse(frame, timestamp) receives a (channels, frame_size) array that is
+    reused between calls, and the wall-clock time of the frame's first sample,
+    derived from the sample count (plus any samples the capture ring dropped)
+    so it does not depend on when the worker ran.
+    Successive frames start hop samples apart (frame_size, i.e. no overlap, by
+    default).
+
+    With decimate > 1 the worker first low-passes and decimates everything the
+    callback captured (see BasuriDecimate.Decimator) into a ring of its own,
+    and frames come from that: frame_size and hop then count samples at the
+    analysis rate `fs` = capture.fs / decimate. The callback is unchanged, and
+    when analysis falls behind, blocks are dropped (and counted) in the
+    capture ring as without decimation.
+    """
+
+    def __init__(self, capture, frame_size, analyse, hop=None, poll=None, decimate=1):
+        super().__init__(daemon=True)
+        self.capture = capture
+        self.frame_size = frame_size
+        self.hop = hop or frame_size
+        self.analyse = analyse
+        self.decimate = decimate
+        self.fs = capture.fs / decimate
+        self.poll = poll if poll is not None else self.hop / self.fs / 2
+        if decimate > 1:
+            self.decimator = Decimator(decimate, capture.channels)
+            self.ring = RingBuffer(capture.ring.capacity // decimate, capture.channels)
+            self._block = np.empty((capture.channels, capture.blocksize), dtype=capture.ring.buffer.dtype)
+            # Output m of the decimator is centred on input sample m * decimate + offset
+            self._offset = decimate - 1 - self.decimator.delay
+        else:
+            self.decimator = None
+            self.ring = capture.ring
+            self._offset = 0
+        self.frame = np.empty((capture.channels, frame_size), dtype=self.ring.buffer.dtype)
+        self.frames = 0
+        self.running = False
+
+    def _decimate(self):
+        # Only drain what the analysis ring has room for: a backlog then stays in the
+        # capture ring, and blocks dropped there show up in capture.stats()
+        source = self.capture.ring
+        room = self.ring.capacity - -(-self.capture.blocksize // self.decimate)
+        while source.available >= self.capture.blocksize and self.ring.available <= room:
+            source.read(self.capture.blocksize, out=self._block)
+            self.ring.write(self.decimator.process(self._block).T)
+
+    def run(self):
+        self.running = True
+        ring = self.ring
+        while self.running:
+            if self.decimator is not None:
+                self._decimate()
+            position = ring.read_pos
+            if ring.read(self.frame_size, out=self.frame, hop=self.hop) is None:
+                time.sleep(self.poll)
+                continue
+            sample = position * self.decimate + self._offset
+            sample += self.capture.ring.dropped_before(sample)
+            self.analyse(self.frame, self.capture.start_time + sample / self.capture.fs)
+            self.frames += 1
+
+    def stop(self):
+        """Stop and wait for the frame in progress, so its results are in before anything is closed."""
+        self.running = False
+        if self.is_alive() and threading.current_thread() is not self:
+            self.join()
@@ -0,0 +1,117 @@
+import glob
+import os
+
+import numpy as np
+
+# One pitch estimate: wall-clock time (epoch seconds), frequency (Hz, NaN when silent), amplitude
+HISTORY_DTYPE = np.dtype([
+    ('time', '<f8'),
+    ('frequency', '<f4'),
+    ('amplitude', '<f4'),
+])
+
+
+class PitchHistory:
+    """
+    Fixed-capacity history of pitch estimates in a preallocated NumPy ring.
+
+    The ring has `spare` slots more than the capacity, and the buffer is
+    twice the ring: every record is written at both i and i + slots, so the
+    most recent records are always one contiguous slice. append() is O(1) and
+    view() returns them in order without copying. Fields of the view
+    (view()['time'] etc.) are views too.
+
+    One thread appends and others may read. Appends write outside every view
+    until `spare` further records have been appended, so a view stays in
+    order for that long; a reader that holds on to one longer should copy it.
+
+    Parameters:
+        capacity (int): Records kept, e.g. window seconds * updates per second.
+        recorder (SessionRecorder): Optional, also gets every appended record.
+        spare (int): Appends a view survives intact while a reader uses it.
+    """
+
+    def __init__(self, capacity, recorder=None, spare=16):
+        self.capacity = int(capacity)
+        self.slots = self.capacity + spare
+        self.buffer = np.zeros(2 * self.slots, dtype=HISTORY_DTYPE)
+        self.count = 0  # total records appended
+        self.recorder = recorder
+
+    def __len__(self):
+        return min(self.count, self.capacity)
+
+    def append(self, timestamp, frequency, amplitude):
+        i = self.count % self.slots
+        record = (timestamp, frequency, amplitude)
+        self.buffer[i] = record
+        self.buffer[i + self.slots] = record
+        self.count += 1
+        if self.recorder is not None:
+            self.recorder.append(record)
+
+    def view(self, n=None):
+        """The last n records (all of them by default), oldest first, as a view."""
+        count = self.count
+        n = min(count, self.capacity) if n is None else min(n, count, self.capacity)
+        end = count % self.slots + self.slots if count >= self.slots else count
+        return self.buffer[end - n:end]
+
+
+class SessionRecorder:
+    """
+    Append-only recording of a whole session as .npy memmap segments.
+
+    Records go straight into segment files (session-0000.npy, session-0001.npy,
+    ...) of segment_records HISTORY_DTYPE records each, opened with
+    np.lib.format.open_memmap, so recording costs one record copy per frame
+    and the OS writes pages back in the background. A segment's unused tail
+    stays zero (sparse on most filesystems); load_session() cuts it off.
+
+    Parameters:
+        directory (str): Where the segments go; created if missing.
+        segment_records (int): Records per file, one hour at 40 updates/s by default.
+    """
+
+    def __init__(self, directory, segment_records=144000):
+        self.directory = directory
+        self.segment_records = segment_records
+        os.makedirs(directory, exist_ok=True)
+        self.segments = len(glob.glob(os.path.join(directory, 'session-*.npy')))  # continue an existing session
+        self.segment = None
+        self.position = 0
+
+    def _next_segment(self):
+        self.close()
+        path = os.path.join(self.directory, f"session-{self.segments:04d}.npy")
+        self.segment = np.lib.format.open_memmap(path, mode='w+', dtype=HISTORY_DTYPE, shape=(self.segment_records,))
+        self.segments += 1
+        self.position = 0
+
+    def append(self, record):
+        if self.segment is None or self.position == self.segment_records:
+            self._next_segment()
+        self.segment[self.position] = record
+        self.position += 1
+
+    def close(self):
+        if self.segment is not None:
+            self.segment.flush()
+            self.segment = None
+
+
+def load_session(directory):
+    """
+    All records of a recorded session, oldest first.
+
+    A single segment comes back as a read-only memmap view, so even hours of
+    pitch data load instantly; several segments are concatenated.
+    """
+    parts = []
+    for path in sorted(glob.glob(os.path.join(directory, 'session-*.npy'))):
+        segment = np.load(path, mmap_mode='r')
+        written = segment['time'] > 0  # epoch times are never 0, unused records are
+        parts.append(segment[:len(segment) if written.all() else int(np.argmin(written))])
+    if not parts:
+        return np.zeros(0, dtype=HISTORY_DTYPE)
+    return parts[0] if len(parts) == 1 else np.concatenate(parts)
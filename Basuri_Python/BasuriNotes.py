@@ -0,0 +1,88 @@
+import numpy as np
+
+# Equal temperament, A4 = 440 Hz (MIDI note 69)
+A4_FREQ = 440.0
+A4_MIDI = 69
+NOTE_NAMES = ['C', 'C#', 'D', 'D#', 'E', 'F', 'F#', 'G', 'G#', 'A', 'A#', 'B']
+
+# Range a bansuri can reach: bass flutes go down to C3, the smallest ones up to C7
+LOWEST_MIDI = 48   # C3
+HIGHEST_MIDI = 96  # C7
+
+# Notes shown on the GUI ladder
+NOTE_ORDER = ['C4', 'C#4', 'D4', 'D#4', 'E4', 'F4', 'F#4', 'G4', 'G#4', 'A4', 'A#4', 'B4', 'C5']
+
+
+def note_to_midi(name):
+    """Convert a note name such as 'C#4' to its MIDI number."""
+    return NOTE_NAMES.index(name[:-1]) + 12 * (int(name[-1]) + 1)
+
+
+def midi_to_freq(midi):
+    """Frequency in Hz of a MIDI note number (scalar or array)."""
+    return A4_FREQ * 2.0 ** ((np.asarray(midi, dtype=np.float64) - A4_MIDI) / 12.0)
+
+
+def note_freq(name):
+    return float(midi_to_freq(note_to_midi(name)))
+
+
+NOTES_FREQ = {note: round(note_freq(note), 2) for note in NOTE_ORDER}
+
+
+def freq_to_midi(freq):
+    """Fractional MIDI number for each frequency, NaN where freq <= 0."""
+    freq = np.asarray(freq, dtype=np.float64)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        midi = A4_MIDI + 12.0 * np.log2(freq / A4_FREQ)
+    return np.where(freq > 0, midi, np.nan)
+
+
+def freq_to_note(freq, lowest=LOWEST_MIDI, highest=HIGHEST_MIDI):
+    """
+    Map frequencies to the nearest equal-tempered note.
+
+    Works on a scalar or on a whole array of frequencies at once.
+
+    Parameters:
+        freq (float or array): Frequencies in Hz.
+        lowest, highest (int): MIDI range that counts as a note.
+
+    Returns:
+        tuple: (note_index, octave, cents) arrays. note_index is 0-11 into
+        NOTE_NAMES, or -1 where freq is outside the range; cents is the
+        deviation from the note in [-50, 50] (NaN where there is no note).
+    """
+    exact = freq_to_midi(freq)
+    nearest = np.rint(exact)
+    valid = (nearest >= lowest) & (nearest <= highest)
+    midi = np.where(valid, nearest, 0).astype(np.int64)
+    note_index = np.where(valid, midi % 12, -1)
+    octave = np.where(valid, midi // 12 - 1, -1)
+    cents = np.where(valid, (exact - nearest) * 100.0, np.nan)
+    return note_index, octave, cents
+
+
+def note_name(note_index, octave):
+    """Name of a single note, e.g. (9, 4) -> 'A4', or None for index -1."""
+    if note_index < 0:
+        return None
+    return NOTE_NAMES[int(note_index)] + str(int(octave))
+
+
+# Lookup table from MIDI number + 1 to note name; slot 0 (MIDI -1) means "no note"
+_MIDI_NAMES = np.array([None] + [NOTE_NAMES[m % 12] + str(m // 12 - 1) for m in range(128)], dtype=object)
+
+
+def freq_to_note_name(freq):
+    """
+    Nearest note name for a frequency, or None if it is out of range.
+
+    A scalar gives a str (or None); an array, e.g. one frequency per channel,
+    gives an object array of names from a single table lookup.
+    """
+    note_index, octave, _ = freq_to_note(freq)
+    midi = np.where(note_index >= 0, (octave + 1) * 12 + note_index, -1)
+    if midi.ndim == 0:
+        return _MIDI_NAMES[int(midi) + 1]
+    return _MIDI_NAMES[midi + 1]
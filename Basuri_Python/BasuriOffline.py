@@ -0,0 +1,188 @@
+"""
+Run the Basuri pitch pipeline over recordings instead of the microphone.
+
+    python BasuriOffline.py practice.wav -o practice.csv --engine yin
+    python BasuriOffline.py take.raw --raw --fs 44100 --dtype int16 -o take.npy
+
+The input is memory-mapped and framed with zero-copy strided views, one chunk
+of frames at a time, so memory use does not grow with the file length.
+"""
+import argparse
+import struct
+import sys
+import time
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from BasuriNotes import freq_to_note, freq_to_note_name
+from BasuriPitch import DETECTORS, make_detector
+
+# (format tag, bits per sample) -> sample dtype; 1 = PCM, 3 = IEEE float
+_WAV_DTYPES = {
+    (1, 8): np.uint8,
+    (1, 16): np.dtype('<i2'),
+    (1, 32): np.dtype('<i4'),
+    (3, 32): np.dtype('<f4'),
+    (3, 64): np.dtype('<f8'),
+}
+_WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+
+PITCH_DTYPE = np.dtype([
+    ('time', '<f8'),
+    ('frequency', '<f4'),
+    ('amplitude', '<f4'),
+    ('midi', '<i2'),   # -1 where no note is in range
+    ('cents', '<f4'),
+])
+
+
+def read_wav(path):
+    """
+    Memory-map the sample data of a WAV file.
+
+    Returns:
+        tuple: (samples, fs) where samples is a read-only (frames, channels) memmap.
+    """
+    with open(path, 'rb') as f:
+        riff, _, wave = struct.unpack('<4sI4s', f.read(12))
+        if riff != b'RIFF' or wave != b'WAVE':
+            raise ValueError(f"{path} is not a WAV file")
+        tag = None
+        while True:
+            header = f.read(8)
+            if len(header) < 8:
+                raise ValueError(f"{path} has no data chunk")
+            chunk_id, size = struct.unpack('<4sI', header)
+            if chunk_id == b'fmt ':
+                body = f.read(size + (size & 1))
+                tag, channels, fs, _, block_align, bits = struct.unpack('<HHIIHH', body[:16])
+                if tag == _WAVE_FORMAT_EXTENSIBLE:
+                    tag = struct.unpack('<H', body[24:26])[0]
+            elif chunk_id == b'data':
+                offset = f.tell()
+                data_size = min(size, f.seek(0, 2) - offset)  # streamed WAVs may leave size unset
+                break
+            else:
+                f.seek(size + (size & 1), 1)
+    if tag is None:
+        raise ValueError(f"{path} has no fmt chunk")
+    dtype = _WAV_DTYPES.get((tag, bits))
+    if dtype is None:
+        raise ValueError(f"Unsupported WAV sample format: tag {tag}, {bits} bits")
+    frames = data_size // block_align
+    return np.memmap(path, dtype=dtype, mode='r', offset=offset, shape=(frames, channels)), fs
+
+
+def read_raw(path, dtype='int16', channels=1):
+    """Memory-map headerless interleaved PCM."""
+    raw = np.memmap(path, dtype=np.dtype(dtype), mode='r')
+    return raw[:len(raw) - len(raw) % channels].reshape(-1, channels)
+
+
+def to_float(samples):
+    """Convert a chunk of PCM samples to float32 in [-1, 1)."""
+    if samples.dtype == np.uint8:
+        return (samples.astype(np.float32) - 128) / 128
+    if samples.dtype.kind == 'i':
+        return samples.astype(np.float32) / np.float32(2 ** (8 * samples.dtype.itemsize - 1))
+    return samples.astype(np.float32, copy=False)
+
+
+def _frame_count(n_samples, frame_size, hop):
+    return 1 + (n_samples - frame_size) // hop if n_samples >= frame_size else 0
+
+
+def iter_frames(samples, frame_size, hop, chunk_frames=512):
+    """
+    Yield (index of first frame, frames) over a 1-D sample array.
+
+    Only chunk_frames frames are materialised at a time: each chunk is read
+    from the (memory-mapped) input once, converted to float32, and framed as
+    an overlapping strided view without copying.
+    """
+    n_frames = _frame_count(len(samples), frame_size, hop)
+    for start in range(0, n_frames, chunk_frames):
+        stop = min(start + chunk_frames, n_frames)
+        segment = to_float(samples[start * hop:(stop - 1) * hop + frame_size])
+        yield start, sliding_window_view(segment, frame_size)[::hop]
+
+
+def analyse(samples, fs, detector, frame_size=2048, hop=512, chunk_frames=512):
+    """
+    Generator of PITCH_DTYPE record arrays, one per chunk, for a mono sample array.
+
+    Frame times are the centre of each frame, in seconds from the start.
+    """
+    for start, frames in iter_frames(samples, frame_size, hop, chunk_frames):
+        freq, amp = detector.detect(frames, fs)
+        note_index, octave, cents = freq_to_note(freq)
+        records = np.empty(len(frames), dtype=PITCH_DTYPE)
+        records['time'] = ((start + np.arange(len(frames))) * hop + frame_size / 2) / fs
+        records['frequency'] = freq
+        records['amplitude'] = amp
+        records['midi'] = np.where(note_index >= 0, (octave + 1) * 12 + note_index, -1)
+        records['cents'] = cents
+        yield records
+
+
+def write_csv(path, chunks):
+    count = 0
+    with open(path, 'w') as f:
+        f.write('time,frequency,amplitude,note,cents\n')
+        for records in chunks:
+            labels = freq_to_note_name(records['frequency'])
+            f.writelines(f"{t:.4f},{hz:.2f},{a:.5g},{name or ''},{c:.1f}\n"
+                         for t, hz, a, name, c in zip(records['time'], records['frequency'],
+                                                      records['amplitude'], labels, records['cents']))
+            count += len(records)
+    return count
+
+
+def write_npy(path, chunks, total):
+    out = np.lib.format.open_memmap(path, mode='w+', dtype=PITCH_DTYPE, shape=(total,))
+    count = 0
+    for records in chunks:
+        out[count:count + len(records)] = records
+        count += len(records)
+    out.flush()
+    return count
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Offline Basuri pitch analysis of WAV or raw PCM recordings.")
+    parser.add_argument('input', help="WAV file, or raw PCM with --raw")
+    parser.add_argument('-o', '--output', required=True, help="output .csv or .npy (structured records)")
+    parser.add_argument('--engine', default='fft', choices=sorted(DETECTORS))
+    parser.add_argument('--frame', type=int, default=2048, help="samples per analysis frame")
+    parser.add_argument('--hop', type=int, default=512, help="samples between frame starts")
+    parser.add_argument('--channel', type=int, default=0, help="channel to analyse")
+    parser.add_argument('--raw', action='store_true', help="input is headerless PCM")
+    parser.add_argument('--fs', type=int, default=44100, help="sampling rate of raw input")
+    parser.add_argument('--dtype', default='int16', help="sample type of raw input")
+    parser.add_argument('--channels', type=int, default=1, help="channel count of raw input")
+    args = parser.parse_args(argv)
+
+    if args.raw:
+        samples, fs = read_raw(args.input, args.dtype, args.channels), args.fs
+    else:
+        samples, fs = read_wav(args.input)
+    mono = samples[:, args.channel]
+    detector = make_detector(args.engine)
+    chunks = analyse(mono, fs, detector, args.frame, args.hop)
+
+    start = time.perf_counter()
+    if args.output.endswith('.npy'):
+        count = write_npy(args.output, chunks, _frame_count(len(mono), args.frame, args.hop))
+    else:
+        count = write_csv(args.output, chunks)
+    elapsed = time.perf_counter() - start
+
+    audio_seconds = len(mono) / fs
+    print(f"{count} frames from {audio_seconds:.1f} s of audio in {elapsed:.2f} s "
+          f"({audio_seconds / max(elapsed, 1e-9):.0f}x real time, "
+          f"{detector.cost_per_frame * 1e6:.0f} us/frame in {detector.name})", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
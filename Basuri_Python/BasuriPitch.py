@@ -0,0 +1,646 @@
+import inspect
+import math
+import time
+from functools import lru_cache
+
+import numpy as np
+
+from BasuriNotes import NOTES_FREQ
+
+_EPS = 1e-12
+_RFFT_HAS_OUT = 'out' in inspect.signature(np.fft.rfft).parameters  # NumPy >= 2.0
+
+
+@lru_cache(maxsize=16)
+def hann_window(n):
+    """Cached Hann window of length n (read-only, shared between callers)."""
+    window = np.hanning(n).astype(np.float32)
+    window.flags.writeable = False
+    return window
+
+
+def fft_size(n):
+    """Smallest length >= n of the form 2**k, 3 * 2**k or 5 * 2**k, which np.fft transforms fastest."""
+    best = 1 << max(int(n - 1).bit_length(), 0)
+    for factor in (3, 5):
+        size = factor
+        while size < n:
+            size *= 2
+        best = min(best, size)
+    return best
+
+
+def _parabolic(left, centre, right):
+    """Vertex offset (-0.5..0.5) and height of the parabola through three points."""
+    denom = left - 2 * centre + right
+    with np.errstate(divide='ignore', invalid='ignore'):
+        delta = np.where(denom != 0, 0.5 * (left - right) / denom, 0.0)
+    delta = np.clip(delta, -0.5, 0.5)
+    return delta, centre - 0.25 * (left - right) * delta
+
+
+def interpolate_peak(mag, method='gaussian'):
+    """
+    Locate the largest bin along the last axis with sub-bin precision.
+
+    Fits a parabola through the peak bin and its two neighbours, either on the
+    raw magnitudes ('parabolic') or on their logarithm ('gaussian', which is
+    exact for a Gaussian-shaped peak and very close for a Hann-windowed one).
+
+    Parameters:
+        mag (array): Magnitude spectrum, 1-D or stacked (..., bins).
+        method (str): 'gaussian', 'parabolic' or None for plain argmax.
+
+    Returns:
+        tuple: (fractional bin index, interpolated peak magnitude).
+    """
+    mag = np.asarray(mag)
+    n = mag.shape[-1]
+    if mag.ndim == 1 and method is not None and n >= 3:
+        return _interpolate_peak_1d(mag, method)
+    idx = np.argmax(mag, axis=-1)
+    centre = np.take_along_axis(mag, idx[..., None], axis=-1)[..., 0]
+    if method is None or n < 3:
+        return idx.astype(np.float64), centre
+
+    left = np.take_along_axis(mag, np.maximum(idx - 1, 0)[..., None], axis=-1)[..., 0]
+    right = np.take_along_axis(mag, np.minimum(idx + 1, n - 1)[..., None], axis=-1)[..., 0]
+    if method == 'gaussian':
+        left, b, right = np.log(left + _EPS), np.log(centre + _EPS), np.log(right + _EPS)
+    elif method == 'parabolic':
+        b = centre
+    else:
+        raise ValueError(f"Unknown interpolation method: {method}")
+
+    delta, peak = _parabolic(left, b, right)
+    delta = np.where((idx > 0) & (idx < n - 1), delta, 0.0)
+    if method == 'gaussian':
+        peak = np.exp(peak) - _EPS
+    return idx + delta, peak
+
+
+def _interpolate_peak_1d(mag, method):
+    """interpolate_peak for a single spectrum, in scalar arithmetic (the array version costs ~60 us)."""
+    idx = int(mag.argmax())
+    centre = float(mag[idx])
+    if idx == 0 or idx == len(mag) - 1:
+        return float(idx), centre
+    left, right = float(mag[idx - 1]), float(mag[idx + 1])
+    if method == 'gaussian':
+        left, b, right = math.log(left + _EPS), math.log(centre + _EPS), math.log(right + _EPS)
+    elif method == 'parabolic':
+        b = centre
+    else:
+        raise ValueError(f"Unknown interpolation method: {method}")
+    denom = left - 2 * b + right
+    delta = min(max(0.5 * (left - right) / denom, -0.5), 0.5) if denom != 0 else 0.0
+    peak = b - 0.25 * (left - right) * delta
+    if method == 'gaussian':
+        peak = math.exp(peak) - _EPS
+    return idx + delta, peak
+
+
+def peak_frequency(audio, fs, pad=2, method='gaussian'):
+    """
+    Dominant frequency of a block (or stack of blocks along the last axis).
+
+    The block is Hann-windowed, zero-padded to pad * len(audio) samples and
+    the strongest rfft bin is refined with interpolate_peak, so 512-1024
+    sample blocks resolve the peak to a few cents instead of a whole bin.
+
+    Returns:
+        tuple: (frequency in Hz, peak magnitude).
+    """
+    audio = np.asarray(audio)
+    n = audio.shape[-1]
+    nfft = n * pad
+    mag = np.abs(np.fft.rfft(audio * hann_window(n), n=nfft))
+    bin_pos, amp = interpolate_peak(mag, method)
+    return bin_pos * fs / nfft, amp
+
+
+class STFT:
+    """
+    Streaming short-time Fourier transform of fixed-size frames.
+
+    The Hann window, zero-padding buffer, frequency axis and output arrays are
+    built once and reused, so analysing a frame allocates nothing beyond what
+    np.fft itself needs (nothing at all on NumPy >= 2.0). Frames may overlap:
+    the hop between them is decided by whoever feeds them (see
+    BasuriCapture.RingBuffer.read).
+
+    Parameters:
+        frame_size (int): Samples per frame.
+        fs (int): Sampling rate.
+        pad (int): Zero-padding factor; the transform length is pad * frame_size
+            rounded up to an FFT-friendly size (see fft_size). Interpolation
+            already resolves the peak to about a cent, so 1 is enough.
+    """
+
+    def __init__(self, frame_size, fs, pad=1):
+        self.frame_size = frame_size
+        self.fs = fs
+        self.nfft = fft_size(frame_size * pad)
+        self.window = hann_window(frame_size)
+        self.freqs = np.fft.rfftfreq(self.nfft, 1 / fs)
+        self.bin_hz = fs / self.nfft
+        self._shape = None
+
+    def _allocate(self, shape):
+        self._shape = shape
+        self._padded = np.zeros(shape + (self.nfft,), dtype=np.float32)
+        self.spectrum = np.empty(shape + (self.nfft // 2 + 1,), dtype=np.complex64)
+        self.magnitude = np.empty(shape + (self.nfft // 2 + 1,), dtype=np.float32)
+
+    def transform(self, frames):
+        """Magnitude spectrum of frames shaped (..., frame_size); the result is reused."""
+        shape = frames.shape[:-1]
+        if shape != self._shape:
+            self._allocate(shape)
+        np.multiply(frames, self.window, out=self._padded[..., :self.frame_size])
+        if _RFFT_HAS_OUT:
+            np.fft.rfft(self._padded, axis=-1, out=self.spectrum)
+        else:
+            self.spectrum[...] = np.fft.rfft(self._padded, axis=-1)
+        np.abs(self.spectrum, out=self.magnitude)
+        return self.magnitude
+
+    def peak(self, frames, method='gaussian'):
+        """(frequency in Hz, peak magnitude) of the strongest bin of each frame."""
+        bin_pos, amp = interpolate_peak(self.transform(frames), method)
+        return bin_pos * self.bin_hz, amp
+
+
+class PitchDetector:
+    """
+    Common interface of the pitch-detection engines.
+
+    detect() accepts one block or a stack of blocks (..., samples) and returns
+    (frequency, amplitude). Every call is timed so engines can be compared on
+    the machine they run on: last_cost and cost_per_frame are seconds per
+    analysed block. Engines that compute a spectrum expose the last one as
+    `magnitude` (None otherwise), e.g. for spectral-flux onset detection.
+    """
+    name = None
+    magnitude = None
+
+    def __init__(self, fmin=100.0, fmax=2200.0):
+        self.fmin = fmin
+        self.fmax = fmax
+        self.last_cost = 0.0
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.frames = 0
+        self.total_time = 0.0
+
+    @property
+    def cost_per_frame(self):
+        return self.total_time / self.frames if self.frames else 0.0
+
+    def detect(self, audio, fs):
+        audio = np.asarray(audio, dtype=np.float32)
+        start = time.perf_counter()
+        freq, amp = self._estimate(audio, fs)
+        elapsed = time.perf_counter() - start
+        count = audio[..., 0].size
+        self.last_cost = elapsed / count
+        self.frames += count
+        self.total_time += elapsed
+        return freq, amp
+
+    def _lag_range(self, fs, n):
+        min_lag = max(int(fs / self.fmax), 2)
+        max_lag = min(int(np.ceil(fs / self.fmin)), n // 2)
+        return min_lag, max_lag
+
+    def _estimate(self, audio, fs):
+        raise NotImplementedError
+
+
+class FFTPeakDetector(PitchDetector):
+    """Strongest spectral peak; amplitude is the peak bin magnitude."""
+    name = 'fft'
+
+    def __init__(self, fmin=100.0, fmax=2200.0, pad=1, method='gaussian'):
+        super().__init__(fmin, fmax)
+        self.pad = pad
+        self.method = method
+
+        self._stft = None
+        self._stfts = {}  # (frame_size, fs) -> STFT, so a changing window size does not rebuild them
+
+    @property
+    def magnitude(self):
+        return None if self._stft is None else self._stft.magnitude
+
+    def _estimate(self, audio, fs):
+        key = (audio.shape[-1], fs)
+        stft = self._stfts.get(key)
+        if stft is None:
+            stft = self._stfts[key] = STFT(audio.shape[-1], fs, self.pad)
+        self._stft = stft
+        return stft.peak(audio, self.method)
+
+
+class YinDetector(PitchDetector):
+    """
+    YIN (de Cheveigne & Kawahara), vectorised over frames.
+
+    The difference function is built from an FFT cross-correlation and running
+    energy sums, so there is no per-lag Python loop. Finds the fundamental where
+    the FFT peak would pick a stronger harmonic. Amplitude is the frame RMS.
+    """
+    name = 'yin'
+
+    def __init__(self, fmin=100.0, fmax=2200.0, threshold=0.15):
+        super().__init__(fmin, fmax)
+        self.threshold = threshold
+
+    def _estimate(self, audio, fs):
+        n = audio.shape[-1]
+        min_lag, max_lag = self._lag_range(fs, n)
+        w = n - max_lag
+        nfft = 1 << int(np.ceil(np.log2(n + w)))
+
+        # r(tau) = sum_j x[j] x[j + tau] over the integration window w
+        cross = np.fft.irfft(np.fft.rfft(audio, nfft) * np.conj(np.fft.rfft(audio[..., :w], nfft)), nfft)
+        cross = cross[..., :max_lag + 1]
+        power = np.cumsum(np.square(audio, dtype=np.float64), axis=-1)
+        power = np.concatenate([np.zeros(audio.shape[:-1] + (1,)), power], axis=-1)
+        energy = power[..., w:w + max_lag + 1] - power[..., :max_lag + 1]
+        diff = energy[..., :1] + energy - 2 * cross
+
+        # Cumulative mean normalised difference
+        lags = np.arange(1, max_lag + 1)
+        running = np.cumsum(diff[..., 1:], axis=-1)
+        cmnd = np.ones_like(diff)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            cmnd[..., 1:] = np.where(running > 0, diff[..., 1:] * lags / running, 1.0)
+
+        # First local minimum under the threshold, else the global minimum
+        mid = cmnd[..., 1:-1]
+        trough = (mid < cmnd[..., :-2]) & (mid <= cmnd[..., 2:]) & (mid < self.threshold)
+        trough[..., :min_lag - 1] = False
+        has_trough = trough.any(axis=-1)
+        tau = np.where(has_trough, np.argmax(trough, axis=-1),
+                       np.argmin(mid[..., min_lag - 1:], axis=-1) + min_lag - 1) + 1
+
+        left = np.take_along_axis(cmnd, (tau - 1)[..., None], axis=-1)[..., 0]
+        centre = np.take_along_axis(cmnd, tau[..., None], axis=-1)[..., 0]
+        right = np.take_along_axis(cmnd, np.minimum(tau + 1, max_lag)[..., None], axis=-1)[..., 0]
+        delta, _ = _parabolic(left, centre, right)
+        freq = fs / (tau + delta)
+        amp = np.sqrt(power[..., -1] / n)
+        return freq, amp
+
+
+@lru_cache(maxsize=16)
+def _window_autocorr(n, nfft):
+    """Autocorrelation of the Hann window, used to undo the taper bias of the ACF."""
+    spec = np.fft.rfft(hann_window(n), nfft)
+    acf = np.fft.irfft(spec.real ** 2 + spec.imag ** 2, nfft)
+    acf = np.maximum(acf / acf[0], 1e-3)
+    acf.flags.writeable = False
+    return acf
+
+
+class AutocorrDetector(PitchDetector):
+    """
+    FFT autocorrelation, normalised by the window's own autocorrelation.
+
+    Picks the first ACF peak within peak_ratio of the highest one in the lag
+    range, which avoids jumping an octave down on strongly periodic tones.
+    Amplitude is the frame RMS.
+    """
+    name = 'acf'
+
+    def __init__(self, fmin=100.0, fmax=2200.0, peak_ratio=0.9):
+        super().__init__(fmin, fmax)
+        self.peak_ratio = peak_ratio
+
+    def _estimate(self, audio, fs):
+        n = audio.shape[-1]
+        min_lag, max_lag = self._lag_range(fs, n)
+        nfft = 1 << int(np.ceil(np.log2(2 * n)))
+        spec = np.fft.rfft(audio * hann_window(n), nfft)
+        acf = np.fft.irfft(spec.real ** 2 + spec.imag ** 2, nfft)[..., :max_lag + 2]
+        acf = acf / (acf[..., :1] + _EPS) / _window_autocorr(n, nfft)[:max_lag + 2]
+
+        # Skip the lobe around lag 0: only consider peaks after the first negative value
+        lags = np.arange(max_lag + 2)
+        negative = acf < 0
+        start = np.where(negative.any(axis=-1), np.argmax(negative, axis=-1), min_lag)
+        in_range = (lags >= np.maximum(start, min_lag)[..., None]) & (lags <= max_lag)
+        peaks = np.zeros(acf.shape, dtype=bool)
+        peaks[..., 1:-1] = (acf[..., 1:-1] >= acf[..., :-2]) & (acf[..., 1:-1] > acf[..., 2:])
+        peaks &= in_range
+        best = np.max(np.where(peaks, acf, -np.inf), axis=-1, keepdims=True)
+        chosen = peaks & (acf >= self.peak_ratio * best)
+        tau = np.where(chosen.any(axis=-1), np.argmax(chosen, axis=-1),
+                       np.argmax(np.where(in_range, acf, -np.inf), axis=-1))
+        tau = np.clip(tau, 1, max_lag)
+
+        left = np.take_along_axis(acf, (tau - 1)[..., None], axis=-1)[..., 0]
+        centre = np.take_along_axis(acf, tau[..., None], axis=-1)[..., 0]
+        right = np.take_along_axis(acf, (tau + 1)[..., None], axis=-1)[..., 0]
+        delta, _ = _parabolic(left, centre, right)
+        freq = fs / (tau + delta)
+        amp = np.sqrt(np.mean(np.square(audio, dtype=np.float64), axis=-1))
+        return freq, amp
+
+
+class GoertzelDetector(PitchDetector):
+    """
+    DFT bank evaluated only at the notes of interest (Goertzel-style).
+
+    Two stages, both matrix products with cached, Hann-windowed cos/sin bases
+    (the values a Goertzel filter would return at those frequencies). The
+    coarse bank holds the first `harmonics` partials of every note in `notes`
+    (NOTES_FREQ by default) and picks the note with the most harmonic-weighted
+    power. The fine bank then evaluates only that note's partials at offsets
+    of 0, +-spacing and +-2 spacing cents, and the best offset is refined with a
+    Gaussian fit, so the answer is always near a configured note, within +-50
+    cents.
+
+    A frame falls back to a full FFTPeakDetector (counted in `fallbacks`) when
+    the note's partials carry less than `confidence` of the frame's power, or
+    its fundamental less than `min_fundamental` of the strongest partial (a
+    note outside the set would otherwise be read as its subharmonic).
+    `magnitude` holds the coarse bank magnitudes, enough for spectral-flux onsets.
+    """
+    name = 'goertzel'
+
+    def __init__(self, fmin=100.0, fmax=2200.0, notes=None, harmonics=3, spacing=25.0, confidence=0.5,
+                 min_fundamental=0.05, pad=1):
+        super().__init__(fmin, fmax)
+        self.notes = np.array(sorted(NOTES_FREQ.values()) if notes is None else notes, dtype=np.float64)
+        self.spacing = spacing
+        self.confidence = confidence
+        self.min_fundamental = min_fundamental
+        self.weights = 1.0 / np.arange(1, harmonics + 1)  # fundamental counts most
+        # (notes, harmonics) frequencies of the coarse bank, (notes, offsets, harmonics) of the fine one
+        self.bank = self.notes[:, None] * np.arange(1, harmonics + 1)
+        self.fine = self.bank[:, None, :] * 2.0 ** (spacing * np.arange(-2, 3) / 1200)[:, None]
+        self.fallback = FFTPeakDetector(fmin, fmax, pad)
+        self.fallbacks = 0
+        self.magnitude = None
+        self._bases = {}
+        self._buffers = {}
+
+    @staticmethod
+    def _windowed_basis(freqs, n, fs):
+        """Hann-windowed (2 * len(freqs), n) cos/sin rows; partials above Nyquist get zero rows."""
+        window = hann_window(n).astype(np.float64)
+        phase = 2 * np.pi * np.outer(freqs / fs, np.arange(n))
+        basis = np.concatenate([np.cos(phase), np.sin(phase)]) * window
+        basis[np.tile(freqs >= fs / 2, 2)] = 0
+        return np.ascontiguousarray(basis, dtype=np.float32)
+
+    def _basis(self, n, fs):
+        """Coarse (2 * bins, n) basis and per-note fine (notes, 2 * bins, n) bases, cached per (n, fs)."""
+        bases = self._bases.get((n, fs))
+        if bases is None:
+            coarse = self._windowed_basis(self.bank.ravel(), n, fs)
+            fine = np.stack([self._windowed_basis(freqs.ravel(), n, fs) for freqs in self.fine])
+            bases = self._bases[(n, fs)] = coarse, fine
+        return bases
+
+    def _estimate_1d(self, audio, fs):
+        """_estimate for a single frame: matrix-vector products into reused buffers, scalars after that."""
+        n = len(audio)
+        coarse, fine = self._basis(n, fs)
+        buffers = self._buffers.get(n)
+        if buffers is None:
+            window = hann_window(n)
+            buffers = self._buffers[n] = (np.empty(len(coarse), np.float32), np.empty(fine.shape[1], np.float32),
+                                          np.empty(n, np.float32), float(window.sum(dtype=np.float64)),
+                                          float(np.dot(window, window)))
+        proj, fine_proj, windowed, window_sum, window_power = buffers
+        bins = self.bank.size
+
+        np.dot(coarse, audio, out=proj)
+        np.square(proj, out=proj)
+        power = proj[:bins] + proj[bins:]
+        note = int((power.reshape(self.bank.shape) @ self.weights).argmax())
+
+        np.dot(fine[note], audio, out=fine_proj)
+        np.square(fine_proj, out=fine_proj)
+        bins = self.fine[0].size
+        offsets = (fine_proj[:bins] + fine_proj[bins:]).reshape(self.fine[0].shape)
+        score = offsets @ self.weights
+        offset = min(max(int(score.argmax()), 1), len(score) - 2)
+        left, centre, right = (math.log(float(v) + _EPS) for v in score[offset - 1:offset + 2])
+        denom = left - 2 * centre + right
+        delta = min(max(0.5 * (left - right) / denom, -0.5), 0.5) if denom != 0 else 0.0
+        cents = min(max((offset - 2 + delta) * self.spacing, -50.0), 50.0)
+        freq = float(self.notes[note]) * 2.0 ** (cents / 1200)
+        self.magnitude = np.sqrt(power)
+
+        partials = offsets[offset]
+        fundamental, total, strongest = float(partials[0]), float(partials.sum()), float(partials.max())
+        np.multiply(audio, hann_window(n), out=windowed)
+        frame_power = float(np.dot(windowed, windowed)) / window_power
+        if 2 * total / window_sum ** 2 < self.confidence * frame_power or fundamental < self.min_fundamental * strongest:
+            self.fallbacks += 1
+            return self.fallback.detect(audio, fs)
+        return freq, math.sqrt(fundamental)
+
+    def _estimate(self, audio, fs):
+        if audio.ndim == 1:
+            return self._estimate_1d(audio, fs)
+        lead, n = audio.shape[:-1], audio.shape[-1]
+        frames = audio.reshape(-1, n)
+        rows = np.arange(len(frames))[:, None]
+        window = hann_window(n)
+        coarse, fine = self._basis(n, fs)
+
+        # Coarse: best note by weighted harmonic power at the note centres
+        proj = frames @ coarse.T
+        bins = self.bank.size
+        power = np.square(proj[:, :bins]) + np.square(proj[:, bins:])
+        self.magnitude = np.sqrt(power).reshape(lead + (bins,))
+        power = power.reshape((len(frames),) + self.bank.shape)
+        note = (power @ self.weights).argmax(axis=-1)
+
+        # Fine: only the winning note's partials, at every offset
+        if len(frames) == 1:
+            proj = frames @ fine[note[0]].T
+        else:
+            proj = np.einsum('fn,fkn->fk', frames, fine[note])
+        bins = self.fine[0].size
+        power = (np.square(proj[:, :bins]) + np.square(proj[:, bins:])).reshape((len(frames),) + self.fine[0].shape)
+
+        # Best offset, fitted with its neighbours
+        score = power @ self.weights  # (frames, offsets)
+        offset = np.clip(score.argmax(axis=-1), 1, score.shape[-1] - 2)[:, None]
+        fit = np.log(score[rows, offset + [-1, 0, 1]] + _EPS)
+        delta, _ = _parabolic(fit[:, 0], fit[:, 1], fit[:, 2])
+        cents = np.clip((offset[:, 0] - 2 + delta) * self.spacing, -50, 50)
+        freq = self.notes[note] * 2.0 ** (cents / 1200)
+
+        # Sinusoid amplitude of a bin is 2 |X| / sum(window); compare its power with the frame's
+        partials = power[rows[:, 0], offset[:, 0]]  # (frames, harmonics)
+        tonal = 2 * partials.sum(axis=-1) / window.sum() ** 2
+        windowed = frames * window
+        frame_power = np.einsum('ij,ij->i', windowed, windowed) / np.dot(window, window)
+        amp = np.sqrt(partials[:, 0])
+
+        weak = (tonal < self.confidence * frame_power) | (partials[:, 0] < self.min_fundamental * partials.max(axis=-1))
+        if weak.any():
+            self.fallbacks += np.count_nonzero(weak)
+            freq[weak], amp[weak] = self.fallback.detect(frames[weak], fs)
+        return freq.reshape(lead), amp.reshape(lead)
+
+
+def zero_crossing_rate(audio):
+    """Fraction of adjacent sample pairs that change sign, along the last axis."""
+    return (audio[..., 1:] * audio[..., :-1] < 0).sum(axis=-1) / (audio.shape[-1] - 1)
+
+
+class GatedDetector(PitchDetector):
+    """
+    Cheap gate and adaptive window in front of another engine.
+
+    Frames whose RMS is below gate_level (silence between phrases) or whose
+    zero-crossing rate is above max_zcr (breath noise without a tone) are not
+    pitch-analysed at all and come back with frequency and amplitude 0. The
+    zero-crossing test only runs on quiet frames: above loud_factor times the
+    gate level a frame is taken to be sounding.
+
+    Sounding frames are analysed over their last `size` samples. The window
+    halves, down to min_size, when the pitch moves by more than change_cents
+    between frames (fast passages), and doubles back up to the full frame once
+    the pitch has held for stable_frames frames (sustained notes). Peak
+    interpolation keeps short windows cent-accurate, so precision holds while
+    silence and fast runs cost a fraction of a full-frame transform.
+
+    Stacked frames are gated channel by channel: `sounding` is then a boolean
+    array, and `magnitude` keeps the spectra of the sounding channels with
+    all-zero rows for the gated ones (a single frame that is gated has None).
+
+    Parameters:
+        detector (PitchDetector): Engine that does the actual estimate.
+        gate_level (float): RMS below which a frame is silent.
+        max_zcr (float): Zero-crossing rate above which a frame is noise.
+        min_size (int): Smallest analysis window in samples.
+        change_cents (float): Pitch movement that counts as a new note.
+        stable_frames (int): Steady frames before the window grows again.
+        loud_factor (float): RMS, in gate levels, above which the ZCR test is skipped.
+    """
+    name = 'gated'
+
+    def __init__(self, detector, gate_level=0.005, max_zcr=0.25, min_size=1024, change_cents=50.0,
+                 stable_frames=4, loud_factor=8.0):
+        super().__init__(detector.fmin, detector.fmax)
+        self.detector = detector
+        self.name = f"gated-{detector.name}"
+        self.gate_level = gate_level
+        self.max_zcr = max_zcr
+        self.min_size = min_size
+        self.change_cents = change_cents
+        self.stable_frames = stable_frames
+        self.loud_factor = loud_factor
+        self.size = None      # current analysis window, None until the first frame
+        self.skipped = 0      # frames rejected by the gate
+        self.sounding = False  # per channel (an array) for stacked frames
+        self._magnitude = None
+        self._pitch = None
+        self._stable = 0
+
+    @property
+    def magnitude(self):
+        return self._magnitude
+
+    def reset_stats(self):
+        super().reset_stats()
+        self.skipped = 0
+
+    def _adapt(self, n, freq):
+        """Shrink the window when the pitch moved, grow it after stable_frames steady frames."""
+        previous, self._pitch = self._pitch, freq
+        if not isinstance(previous, np.ndarray) or previous.shape != freq.shape:
+            return
+        ratio = np.divide(freq, previous, out=np.ones_like(freq), where=(previous > 0) & (freq > 0))
+        self._resize(n, np.any(np.abs(np.log2(ratio)) > self.change_cents / 1200))
+
+    def _resize(self, n, moved):
+        """Apply _adapt's window rule given whether the pitch moved."""
+        if moved:
+            self._stable = 0
+            self.size = max(self.size // 2, min(self.min_size, n))
+        else:
+            self._stable += 1
+            if self._stable >= self.stable_frames and self.size < n:
+                self._stable = 0
+                self.size = min(self.size * 2, n)
+
+    def _estimate_1d(self, audio, fs):
+        """_estimate for a single frame in scalar arithmetic, the front ends' case."""
+        n = len(audio)
+        energy = float(np.dot(audio, audio))
+        gate = n * self.gate_level ** 2
+        if energy < gate or (energy < gate * self.loud_factor ** 2 and
+                             np.count_nonzero(audio[1:] * audio[:-1] < 0) > self.max_zcr * (n - 1)):
+            self.skipped += 1
+            self.sounding = False
+            self._magnitude = None
+            self._pitch = None
+            return 0.0, 0.0
+        self.sounding = True
+        freq, amp = self.detector.detect(audio[n - self.size:], fs)
+        self._magnitude = self.detector.magnitude
+        freq = float(freq)
+        previous, self._pitch = self._pitch, freq
+        if isinstance(previous, float):
+            self._resize(n, previous > 0 and freq > 0 and
+                         abs(math.log2(freq / previous)) > self.change_cents / 1200)
+        return freq, amp
+
+    def _estimate(self, audio, fs):
+        n = audio.shape[-1]
+        if self.size is None or self.size > n:
+            self.size = n
+        if audio.ndim == 1:
+            return self._estimate_1d(audio, fs)
+        # RMS first: it is a single dot product per frame, and silent frames stop here
+        energy = np.einsum('...i,...i->...', audio, audio)
+        sounding = np.asarray(energy >= n * self.gate_level ** 2)
+        quiet = sounding & (energy < n * (self.gate_level * self.loud_factor) ** 2)
+        if quiet.any():
+            sounding[quiet] = zero_crossing_rate(audio[quiet]) <= self.max_zcr
+        skipped = sounding.size - np.count_nonzero(sounding)
+        self.skipped += skipped
+        self.sounding = sounding
+        if not skipped:
+            freq, amp = self.detector.detect(audio[..., n - self.size:], fs)
+            self._magnitude = self.detector.magnitude
+        else:
+            # Gate per channel: gated channels get 0 pitch and an all-zero spectrum, the others their own
+            freq = np.zeros(sounding.shape)
+            amp = np.zeros(sounding.shape)
+            magnitude = self._magnitude
+            if not sounding.any():
+                if magnitude is not None and magnitude.shape[:-1] == sounding.shape:
+                    self._magnitude = np.zeros_like(magnitude)
+                self._pitch = None
+                return freq, amp
+            freq[sounding], amp[sounding] = self.detector.detect(audio[sounding][..., n - self.size:], fs)
+            if self.detector.magnitude is None:
+                self._magnitude = None
+            else:
+                self._magnitude = np.zeros(sounding.shape + self.detector.magnitude.shape[-1:], dtype=np.float32)
+                self._magnitude[sounding] = self.detector.magnitude
+        self._adapt(n, np.asarray(freq, dtype=np.float64))
+        return freq, amp
+
+
+DETECTORS = {cls.name: cls for cls in (FFTPeakDetector, YinDetector, AutocorrDetector, GoertzelDetector)}
+
+
+def make_detector(name='fft', **kwargs):
+    """Create a pitch detector by engine name: 'fft', 'yin', 'acf' or 'goertzel'."""
+    try:
+        return DETECTORS[name](**kwargs)
+    except KeyError:
+        raise ValueError(f"Unknown pitch detector: {name}") from None
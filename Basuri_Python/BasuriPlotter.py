@@ -1,98 +1,249 @@
+import time
 import numpy as np
-import sounddevice as sd
 import matplotlib.pyplot as plt
 import matplotlib.dates as mdates
-from scipy.fft import fft
 from datetime import datetime
-from collections import deque
+from BasuriPitch import make_detector, GatedDetector
+from BasuriCapture import AudioCapture, AnalysisWorker
+from BasuriHistory import PitchHistory, SessionRecorder, load_session
 
 # Parameters
-duration = 0.10  # seconds per analysis
+duration = 0.05  # seconds between pitch updates, twice as often as one FFT per 0.1 s block
 fs = 44100       # sampling rate
-window_size = 60  # seconds of data to show
+decimate = 1     # e.g. 4 to analyse at 11.025 kHz; not cheaper than 44.1 kHz for the fft engine
+analysis_fs = fs // decimate
+hop = int(analysis_fs * duration)
+frame_size = 2048 // decimate  # 46 ms power-of-two frames; with a shorter hop the CPU cost passes the old 0.1 s FFT's
+window_size = 60  # seconds of data to show; long windows (10 min, 1 h) are drawn min/max downsampled
+session_dir = None  # e.g. 'sessions/today': also record every estimate there, for hours if need be
+source = 'mic'     # 'mic', or 'shared' to read the BasuriShared.py capture daemon instead
+engine = 'fft'   # pitch engine: 'fft', 'yin', 'acf' or 'goertzel'
+detector = GatedDetector(make_detector(engine), min_size=1024 // decimate)  # skips silence, shortens the window in fast passages
 
-# Data storage
-timestamps = deque(maxlen=int(window_size / duration))
-frequencies = deque(maxlen=int(window_size / duration))
-amplitudes = deque(maxlen=int(window_size / duration))  # Store amplitude
+# Data storage: epoch time, frequency and amplitude of the last window_size seconds
+recorder = SessionRecorder(session_dir) if session_dir else None
+history = PitchHistory(int(window_size * analysis_fs / hop), recorder)
+
+def configure(**params):
+    # Override the parameters above (e.g. from BasuriCLI.py) and rebuild what depends on them
+    global analysis_fs, frame_size, hop, detector, recorder, history
+    globals().update(params)
+    analysis_fs = fs // decimate
+    hop = int(analysis_fs * duration)
+    frame_size = 2048 // decimate
+    detector = GatedDetector(make_detector(engine), min_size=1024 // decimate)
+    recorder = SessionRecorder(session_dir) if session_dir else None
+    history = PitchHistory(int(window_size * analysis_fs / hop), recorder)
 
 def detect_frequency(audio, fs):
-    N = len(audio)
-    yf = np.abs(fft(audio))
-    xf = np.fft.fftfreq(N, 1 / fs)
-    idx = np.argmax(yf[:N // 2])
-    freq = abs(xf[idx])
-    amp = np.max(yf[:N // 2])  # Amplitude at dominant frequency
-    return freq, amp
-
-def audio_callback(indata, frames, time, status):
-    audio = indata[:, 0]
-    freq, amp = detect_frequency(audio, fs)
-    now = datetime.now()
-    timestamps.append(now)
-    frequencies.append(freq)
-    amplitudes.append(amp)
-
-# Set up matplotlib
-plt.ion()
-fig, ax1 = plt.subplots()
-ax2 = ax1.twinx()  # Second y-axis for amplitude
-
-line1, = ax1.plot([], [], label="Detected Frequency", color='b')
-line2, = ax2.plot([], [], label="Amplitude", color='orange')
-ax1.axhline(440, color='r', linestyle='--', label='A4 (440 Hz)')
-ax1.set_xlabel("Time")
-ax1.set_ylabel("Frequency (Hz)", color='b')
-ax2.set_ylabel("Amplitude", color='orange')
-ax1.set_ylim(0, 1000)
-ax2.set_ylim(0, 1e7)  # You may need to adjust this based on your input
-ax1.legend(loc='upper left')
-ax2.legend(loc='upper right')
-
-def update_plot():
-    if len(timestamps) > 0:
-        ax1.clear()
-        ax2.clear()
-        ax1.plot(timestamps, frequencies, label="Detected Frequency", color='b')
-        ax2.plot(timestamps, amplitudes, label="Amplitude", color='orange')
+    freq, amp = detector.detect(audio, fs)  # amp: peak magnitude ('fft') or RMS, 0 when gated
+    return float(freq) or np.nan, float(amp)  # NaN leaves a gap in the line during silence
+
+def analyse_frame(frame, timestamp):
+    # Runs on the analysis worker, never on the PortAudio callback thread
+    freq, amp = detect_frequency(frame[0], analysis_fs)
+    history.append(timestamp, freq, amp)
+
+def analyse_shared(record):
+    # The capture daemon already ran the detector; only apply the same silence gate
+    sounding = record['level'][0] >= detector.gate_level
+    history.append(record['time'], record['frequency'][0] if sounding else np.nan, record['amplitude'][0])
+
+# Plot settings
+refresh = 1 / 30        # seconds between redraws
+max_annotations = 8     # most recent peaks/valleys/jumps to label
+amp_threshold = 1e5     # Adjust as needed for "big amplitude difference"
+x_margin = 5 / 86400    # look-ahead on the time axis, in days; a full redraw happens when it runs out
+annotate_points = 400   # peaks/valleys/jumps are searched in this many latest raw points
+
+ANNOTATION_STYLE = {  # kind -> (text offset, colour)
+    'peak': ((0, 10), 'blue'),
+    'valley': ((0, -15), 'green'),
+    'jump': ((0, 5), 'purple'),
+}
+
+def find_events(y, a):
+    """Indices and kinds of peaks, valleys and amplitude jumps (same rules as the old per-point loop)."""
+    dy = np.diff(y)
+    inner = np.arange(1, len(y) - 1)
+    peak = (dy[:-1] > 0) & (dy[1:] < 0)
+    valley = (dy[:-1] < 0) & (dy[1:] > 0)
+    jump = ~peak & ~valley & (np.abs(np.diff(a)[:-1]) > amp_threshold)
+    kinds = np.select([peak, valley, jump], [0, 1, 2], -1)
+    keep = kinds >= 0
+    return inner[keep][-max_annotations:], kinds[keep][-max_annotations:]
+
+def minmax_lod(first, x, y, buckets):
+    """
+    Min/max level-of-detail version of a trace for drawing about 2 * buckets points.
+
+    Records are grouped into buckets of a power-of-two size, aligned to their
+    absolute index `first` + i, so bucket edges stay put as new data arrives
+    and the trace does not shimmer between redraws. Each bucket contributes its
+    minimum and maximum in time order, which keeps every spike visible; NaN
+    (silence) is skipped, and an all-NaN bucket stays a gap.
+
+    Returns:
+        tuple: (x, y) to draw; the input itself when it is short enough.
+    """
+    n = len(y)
+    if n <= 2 * buckets:
+        return x, y
+    size = 1 << int(np.ceil(np.log2(n / buckets)))
+    start = -first % size  # drop the oldest partial bucket so the edges stay aligned
+    count = (n - start) // size
+    end = start + count * size
+    blocks = np.asarray(y[start:end], dtype=np.float64).reshape(count, size)
+    gap = np.isnan(blocks)
+    lo = np.where(gap, np.inf, blocks).argmin(axis=1)
+    hi = np.where(gap, -np.inf, blocks).argmax(axis=1)
+    first_pos, second_pos = np.minimum(lo, hi), np.maximum(lo, hi)
+    offsets = np.arange(count) * size + start
+    idx = np.column_stack([offsets + first_pos, offsets + second_pos]).ravel()
+    idx = np.concatenate([idx, np.arange(end, n)])  # newest partial bucket as is
+    return x[idx], y[idx]
+
+class LivePlot:
+    """
+    Frequency/amplitude window redrawn incrementally.
+
+    Artists are created once and only updated afterwards; animated ones are
+    left out of the cached background and drawn on top of it by blitting.
+    """
+
+    def __init__(self):
+        self.fig, self.ax1 = plt.subplots()
+        self.ax2 = self.ax1.twinx()  # Second y-axis for amplitude
+        ax1, ax2 = self.ax1, self.ax2
+        self.line1, = ax1.plot([], [], label="Detected Frequency", color='b', animated=True)
+        self.line2, = ax2.plot([], [], label="Amplitude", color='orange', animated=True)
         ax1.axhline(440, color='r', linestyle='--', label='A4 (440 Hz)')
         ax1.set_xlabel("Time")
         ax1.set_ylabel("Frequency (Hz)", color='b')
         ax2.set_ylabel("Amplitude", color='orange')
-        # Find current min and max frequency in the window
-        min_freq = min(frequencies)
-        max_freq = max(frequencies)
-        delta = max(abs(max_freq - 440), abs(min_freq - 440), 100)
-        ax1.set_ylim(440 - delta, 440 + delta)
-        # Amplitude axis autoscale
-        ax2.set_ylim(0, max(max(amplitudes), 1e5))
+        ax1.set_ylim(340, 540)
+        ax2.set_ylim(0, 1e5)
         ax1.legend(loc='upper left')
         ax2.legend(loc='upper right')
-        ax1.xaxis.set_major_formatter(mdates.DateFormatter('%H:%M:%S'))
-        fig.autofmt_xdate()
-
-        # Annotate peaks, valleys, and significant amplitude jumps
-        y = np.array(frequencies)
-        x = np.array(timestamps)
-        a = np.array(amplitudes)
-        if len(y) > 2:
-            amp_threshold = 1e5  # Adjust as needed for "big amplitude difference"
-            for i in range(1, len(y) - 1):
-                # Peak
-                if y[i] > y[i-1] and y[i] > y[i+1]:
-                    ax1.annotate(f"{y[i]:.1f} Hz\n{a[i]:.0f}", (x[i], y[i]), textcoords="offset points", xytext=(0,10), ha='center', color='blue', fontsize=8)
-                # Valley
-                elif y[i] < y[i-1] and y[i] < y[i+1]:
-                    ax1.annotate(f"{y[i]:.1f} Hz\n{a[i]:.0f}", (x[i], y[i]), textcoords="offset points", xytext=(0,-15), ha='center', color='green', fontsize=8)
-                # Significant jump in amplitude from previous value
-                elif abs(a[i] - a[i-1]) > amp_threshold:
-                    ax1.annotate(f"{y[i]:.1f} Hz\n{a[i]:.0f}", (x[i], y[i]), textcoords="offset points", xytext=(0,5), ha='center', color='purple', fontsize=8)
-
-        plt.pause(0.01)
-
-print("Listening... Speak or play a note.")
-
-with sd.InputStream(callback=audio_callback, channels=1, samplerate=fs, blocksize=int(fs * duration)):
-    while True:
-        sd.sleep(int(duration * 1000))
-        update_plot()
\ No newline at end of file
+        # x values are epoch days (UTC); show them in local time
+        ax1.xaxis.set_major_formatter(mdates.DateFormatter('%H:%M:%S', tz=datetime.now().astimezone().tzinfo))
+        self.fig.autofmt_xdate()
+        self.annotations = [ax1.annotate("", (0, 0), textcoords="offset points", xytext=(0, 0), ha='center',
+                                         fontsize=8, animated=True, visible=False, annotation_clip=True)
+                            for _ in range(max_annotations)]
+        self.background = None
+        self.fig.canvas.mpl_connect('resize_event', self.on_resize)
+
+    def on_resize(self, event):
+        self.background = None
+
+    def is_open(self):
+        return plt.fignum_exists(self.fig.number)
+
+    def rescale(self, x, y, a):
+        """Move the axis limits if the data left them. Returns True when they changed."""
+        ax1, ax2 = self.ax1, self.ax2
+        changed = False
+        if x[-1] > ax1.get_xlim()[1]:
+            ax1.set_xlim(x[-1] - window_size / 86400, x[-1] + x_margin)
+            changed = True
+        # Frequency axis stays centred on 440 Hz; grow at once, shrink only when far too wide
+        delta = max(np.nanmax(np.abs(y - 440), initial=0), 100)
+        current = ax1.get_ylim()[1] - 440
+        if delta > current or delta < current / 2:
+            ax1.set_ylim(440 - delta * 1.1, 440 + delta * 1.1)
+            changed = True
+        top = max(a.max(), 1e5)
+        if top > ax2.get_ylim()[1] or top < ax2.get_ylim()[1] / 4:
+            ax2.set_ylim(0, top * 1.25)
+            changed = True
+        return changed
+
+    def update(self):
+        if len(history) < 2:
+            self.fig.canvas.flush_events()  # nothing to draw yet, but keep the window responsive
+            return
+        # Zero-copy view of the ring; only the x conversion allocates
+        records = history.view()
+        first = history.count - len(records)
+        x = records['time'] / 86400.0
+        # About one min/max pair per pixel column however long the window is
+        buckets = int(self.fig.get_figwidth() * self.fig.dpi)
+        x1, y1 = minmax_lod(first, x, records['frequency'], buckets)
+        x2, a2 = minmax_lod(first, x, records['amplitude'], buckets)
+        self.line1.set_data(x1, y1)
+        self.line2.set_data(x2, a2)
+
+        tail = records[-annotate_points:]
+        x, y, a = x[-annotate_points:], tail['frequency'], tail['amplitude']
+        indices, kinds = find_events(y, a)
+        names = list(ANNOTATION_STYLE)
+        for ann, i, kind in zip(self.annotations, indices, kinds):
+            offset, color = ANNOTATION_STYLE[names[kind]]
+            ann.xy = (x[i], y[i])
+            ann.xyann = offset
+            ann.set_text(f"{y[i]:.1f} Hz\n{a[i]:.0f}")
+            ann.set_color(color)
+            ann.set_visible(True)
+        for ann in self.annotations[len(indices):]:
+            ann.set_visible(False)
+
+        canvas = self.fig.canvas
+        if self.rescale(x1, y1, a2) or self.background is None or not canvas.supports_blit:
+            # Axes, ticks and labels changed: redraw them once and cache the result
+            canvas.draw()
+            self.background = canvas.copy_from_bbox(self.fig.bbox) if canvas.supports_blit else None
+        if self.background is not None:
+            canvas.restore_region(self.background)
+        for artist in (self.line1, self.line2, *self.annotations):
+            artist.axes.draw_artist(artist)
+        if self.background is not None:
+            canvas.blit(self.fig.bbox)
+        canvas.flush_events()
+
+def main():
+    plt.ion()
+    plot = LivePlot()
+    print("Listening... Speak or play a note.")
+
+    if source == 'shared':
+        from BasuriShared import SharedWorker  # multiprocessing is only worth importing here
+        capture = None
+        worker = SharedWorker(analyse_shared)
+    else:
+        capture = AudioCapture(fs=fs, blocksize=hop * decimate)
+        worker = AnalysisWorker(capture, frame_size, analyse_frame, hop=hop, decimate=decimate)
+
+    try:
+        if capture is not None:
+            capture.start()
+        worker.start()
+        while plot.is_open():
+            time.sleep(refresh)
+            plot.update()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        worker.stop()
+        if capture is not None:
+            capture.stop()
+            print("Capture stats:", capture.stats())
+        if recorder is not None:
+            recorder.close()
+
+def plot_session(directory):
+    """Static plot of a session recorded with session_dir."""
+    records = load_session(directory)
+    plot = LivePlot()
+    x = records['time'] / 86400.0
+    for line in (plot.line1, plot.line2):
+        line.set_animated(False)
+    plot.line1.set_data(x, records['frequency'])
+    plot.line2.set_data(x, records['amplitude'])
+    if len(records):
+        plot.rescale(x, records['frequency'], records['amplitude'])
+        plot.ax1.set_xlim(x[0], x[-1])
+    plt.show()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,318 @@
+"""
+Replay recordings through the live capture path, no microphone needed.
+
+    python BasuriReplay.py take.wav                       # detector path, real time
+    python BasuriReplay.py take.wav --path plotter --speed 4
+    python BasuriReplay.py --synth "A4 B4 C5 A4" --path gui --speed 0
+
+ReplayStream stands in for sounddevice.InputStream: it hands the recording
+to the stream callback block by block from its own thread, paced like a sound
+card (speed 1 is real time, 4 is four times faster), so
+AudioCapture.callback, the ring and the AnalysisWorker run exactly as they
+do live. Pass one in with AudioCapture(stream_factory=...).
+
+Speed 0 runs as fast as the pipeline keeps up: before each block the stream
+waits until the capture ring has room for it, so nothing is dropped and
+every run analyses the same frames. Those waits are counted in `stalls`,
+apart from real overflows.
+
+replay() then reports what live profiling would: time spent in the callback,
+ring depth after each block, and end-to-end latency from a block's arrival to
+the end of the first analysis that covers it.
+"""
+import argparse
+import threading
+import time
+from types import SimpleNamespace
+
+import numpy as np
+
+from BasuriCapture import AudioCapture, AnalysisWorker
+
+
+class ReplayStatus:
+    """The subset of sounddevice.CallbackFlags the callbacks look at."""
+
+    def __init__(self, input_overflow=False):
+        self.input_overflow = input_overflow
+
+    def __bool__(self):
+        return self.input_overflow
+
+
+class ReplayStream:
+    """
+    Drop-in for sounddevice.InputStream that plays back an array.
+
+    Parameters:
+        source (array): (frames, channels) or (frames,) samples, played once.
+        samplerate, blocksize, channels, callback: as for sounddevice.InputStream.
+        speed (float): Pace relative to real time; 0 delivers blocks as fast as `room` allows.
+        depth: Optional callable sampled after every callback, e.g. the ring fill.
+        room: Optional callable, true when the consumer can take another block;
+            with speed 0 each block waits for it (backpressure).
+        hold (bool): Started streams wait for release() before the first block,
+            so hooks can be installed on a stream its owner already started.
+
+    After (or during) playback: callback_times (seconds per callback),
+    depths, deliveries (end sample, perf_counter time) per block, `late`
+    (blocks delivered behind schedule, where a real device would overflow)
+    and `stalls` (polls spent waiting for room at speed 0).
+    """
+
+    def __init__(self, source, samplerate, blocksize, channels=1, callback=None, speed=1.0, depth=None, room=None,
+                 hold=False, **kwargs):
+        source = np.asarray(source, dtype=np.float32)
+        if source.ndim == 1:
+            source = source[:, None]
+        self.source = np.ascontiguousarray(np.broadcast_to(source[:, :1], (len(source), channels))
+                                           if source.shape[1] < channels else source[:, :channels])
+        self.samplerate = samplerate
+        self.blocksize = blocksize
+        self.channels = channels
+        self.callback = callback
+        self.speed = speed
+        self.depth = depth
+        self.room = room
+        self.stalls = 0
+        self.callback_times = []
+        self.depths = []
+        self.deliveries = []
+        self.late = 0
+        self.finished = threading.Event()
+        self.released = threading.Event()
+        if not hold:
+            self.released.set()
+        self._thread = None
+        self._running = False
+
+    @property
+    def active(self):
+        return self._running and not self.finished.is_set()
+
+    def _run(self):
+        block_seconds = self.blocksize / self.samplerate
+        self.released.wait()
+        t0 = time.perf_counter()
+        status = ReplayStatus()
+        for k, start in enumerate(range(0, len(self.source) - self.blocksize + 1, self.blocksize)):
+            if not self._running:
+                break
+            if self.speed:
+                # A block can only be delivered once all of it has been "recorded"
+                due = t0 + (k + 1) * block_seconds / self.speed
+                wait = due - time.perf_counter()
+                if wait > 0:
+                    time.sleep(wait)
+                elif wait < -block_seconds / self.speed:
+                    self.late += 1
+            elif self.room is not None:
+                while self._running and not self.room():
+                    self.stalls += 1
+                    time.sleep(block_seconds / 8)
+            indata = self.source[start:start + self.blocksize]
+            arrived = time.perf_counter()
+            self.callback(indata, self.blocksize, SimpleNamespace(inputBufferAdcTime=arrived - t0,
+                                                                  currentTime=arrived - t0), status)
+            self.callback_times.append(time.perf_counter() - arrived)
+            self.deliveries.append((start + self.blocksize, arrived))
+            if self.depth is not None:
+                self.depths.append(self.depth())
+        self.finished.set()
+
+    def start(self):
+        self._running = True
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def release(self):
+        self.released.set()
+
+    def stop(self):
+        self._running = False
+        self.released.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def close(self):
+        self.stop()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class LatencyProbe:
+    """
+    Wraps a worker's analyse callback to time each block from arrival to analysis.
+
+    Once an analysis returns, every block whose last sample lies inside the
+    frames analysed so far gets its latency: now minus its arrival time.
+    """
+
+    def __init__(self, worker, stream):
+        self.worker = worker
+        self.stream = stream
+        self.latencies = []
+        self.analysis_times = []
+        self._next = len(stream.deliveries)  # first delivery without a latency yet
+        self._analyse = worker.analyse
+        worker.analyse = self.analyse
+
+    def analyse(self, frame, timestamp):
+        start = time.perf_counter()
+        self._analyse(frame, timestamp)
+        done = time.perf_counter()
+        self.analysis_times.append(done - start)
+        worker = self.worker
+        # Input samples covered: the frame just analysed ends hop samples before the read position
+        covered = (worker.ring.read_pos - worker.hop + worker.frame_size) * worker.decimate
+        covered += worker.capture.ring.dropped_before(covered - worker.frame_size * worker.decimate)
+        deliveries = self.stream.deliveries
+        while self._next < len(deliveries) and deliveries[self._next][0] <= covered:
+            self.latencies.append(done - deliveries[self._next][1])
+            self._next += 1
+
+
+def replay_factory(source, speed=1.0):
+    """
+    stream_factory for AudioCapture; the stream it opened is left in factory.stream.
+
+    The stream holds its first block until replay() releases it, whoever started it.
+    """
+    def factory(samplerate, blocksize, channels, callback, **kwargs):
+        factory.stream = ReplayStream(source, samplerate, blocksize, channels, callback, speed, hold=True, **kwargs)
+        return factory.stream
+    factory.stream = None
+    return factory
+
+
+def _summary(name, values, scale=1e3, unit='ms'):
+    if not values:
+        return f"{name}: none"
+    values = np.asarray(values) * scale
+    return (f"{name}: p50 {np.percentile(values, 50):.3f} p95 {np.percentile(values, 95):.3f} "
+            f"p99 {np.percentile(values, 99):.3f} max {values.max():.3f} {unit}")
+
+
+def replay(capture, worker, timeout=None):
+    """
+    Run an AudioCapture (opened with a replay_factory) and its AnalysisWorker to the end.
+
+    Either may already be running, as the GUI starts both in its constructor;
+    the stream delivers nothing until replay() has hooked into it.
+
+    Returns:
+        dict: Per-block and per-frame statistics of the run.
+    """
+    if capture.stream is None:
+        capture.start()
+    stream = capture.stream
+    stream.depth = lambda: capture.ring.available
+    stream.room = lambda: capture.ring.available + capture.blocksize <= capture.ring.capacity
+    probe = LatencyProbe(worker, stream)
+    if not worker.is_alive():
+        worker.start()
+    stream.release()
+    stream.finished.wait(timeout)
+    # Let the worker drain what is left; it stops short of a partial frame
+    def pending():
+        undecimated = worker.decimator is not None and capture.ring.available >= capture.blocksize
+        return undecimated or worker.ring.available >= max(worker.frame_size, worker.hop)
+    while pending():
+        time.sleep(worker.poll)
+    time.sleep(4 * worker.poll)
+    worker.stop()
+    capture.stop()
+    return {
+        'blocks': len(stream.deliveries),
+        'frames': len(probe.analysis_times),
+        'late_blocks': stream.late,
+        'stalls': stream.stalls,
+        'callback': stream.callback_times,
+        'analysis': probe.analysis_times,
+        'latency': probe.latencies,
+        'depth': stream.depths,
+        'stats': capture.stats(),
+    }
+
+
+def report(result):
+    print(f"{result['blocks']} blocks, {result['frames']} frames analysed, {result['late_blocks']} blocks late, "
+          f"{result['stalls']} waits for room")
+    print(_summary("callback", result['callback'], 1e6, 'us'))
+    print(_summary("analysis", result['analysis']))
+    print(_summary("latency ", result['latency']))
+    depth = result['depth']
+    print(f"ring depth: mean {np.mean(depth) if depth else 0:.0f} max {max(depth, default=0)} samples")
+    print("capture:", result['stats'])
+
+
+def _setup_detector(factory):
+    import os
+    import sys
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'MacOSProjects', 'PythonProjects'))
+    import BasuriDetector as d
+    capture = AudioCapture(fs=d.fs, blocksize=d.blocksize, channels=d.channels, stream_factory=factory)
+    worker = AnalysisWorker(capture, d.frame_size, d.analyse_frame, decimate=d.decimate)
+    return capture, worker
+
+
+def _setup_plotter(factory):
+    import BasuriPlotter as p
+    capture = AudioCapture(fs=p.fs, blocksize=p.hop * p.decimate, stream_factory=factory)
+    worker = AnalysisWorker(capture, p.frame_size, p.analyse_frame, hop=p.hop, decimate=p.decimate)
+    return capture, worker
+
+
+def _setup_gui(factory):
+    # The real widget, offscreen if there is no display; it opens its stream in the constructor
+    import os
+    import sys
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    from PyQt5.QtWidgets import QApplication
+    from Basuri import BasuriGUI
+    _setup_gui.app = QApplication.instance() or QApplication(sys.argv[:1])
+    gui = BasuriGUI(stream_factory=factory)
+    return gui.capture, gui.worker
+
+
+PATHS = {'detector': _setup_detector, 'plotter': _setup_plotter, 'gui': _setup_gui}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay a recording through a live Basuri capture path.")
+    parser.add_argument('input', nargs='?', help="WAV file to replay")
+    parser.add_argument('--synth', help="replay synthetic flute notes instead, e.g. 'A4 B4 C5'")
+    parser.add_argument('--note-seconds', type=float, default=0.5)
+    parser.add_argument('--path', default='detector', choices=list(PATHS))
+    parser.add_argument('--speed', type=float, default=1.0, help="1 = real time, 0 = as fast as possible")
+    parser.add_argument('--channel', type=int, default=0, help="WAV channel to replay")
+    args = parser.parse_args(argv)
+
+    if args.synth:
+        from BasuriBench import flute_tone
+        from BasuriNotes import note_freq
+        fs = 44100
+        gap = np.zeros(int(0.1 * fs), dtype=np.float32)
+        source = np.concatenate([part for i, name in enumerate(args.synth.split())
+                                 for part in (flute_tone(note_freq(name), fs, args.note_seconds, seed=i)[0], gap)])
+    elif args.input:
+        from BasuriOffline import read_wav, to_float
+        samples, fs = read_wav(args.input)
+        source = to_float(samples[:, args.channel])
+    else:
+        parser.error("give a WAV file or --synth")
+
+    factory = replay_factory(source, args.speed)
+    capture, worker = PATHS[args.path](factory)
+    if capture.fs != fs:
+        parser.error(f"the {args.path} path captures at {capture.fs} Hz, the input is {fs} Hz")
+    report(replay(capture, worker))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,124 @@
+from collections import namedtuple
+
+import numpy as np
+
+from BasuriNotes import freq_to_note, note_name
+
+NoteEvent = namedtuple('NoteEvent', 'note onset offset pitch cents peak')
+NoteEvent.__doc__ = """One played note: name, onset/offset time (s), median pitch (Hz), mean cents offset, peak level."""
+
+
+def spectral_flux(magnitude, previous):
+    """Positive spectral change between two magnitude spectra, normalised to 0..1."""
+    rise = np.maximum(magnitude - previous, 0).sum(axis=-1)
+    return rise / (magnitude.sum(axis=-1) + 1e-12)
+
+
+class NoteSegmenter:
+    """
+    Turns a per-frame pitch stream into NoteEvents.
+
+    A note starts when the frame level rises above on_level and ends when it
+    falls below off_level (hysteresis, so breath noise around one threshold
+    does not chatter). While a note sounds, a new one is started either on a
+    spectral-flux onset (re-articulation of the same note) or when a different
+    note name persists for confirm_frames frames. A flux onset needs flux above
+    flux_threshold and flux_ratio times its running average, so the steady
+    flux of vibrato and breath noise does not trigger it. Segments shorter than
+    min_duration are dropped as glitches.
+
+    push() returns the events completed by that frame, which is an empty list
+    for nearly every frame; `active` is the note currently sounding.
+    """
+
+    def __init__(self, on_level=0.01, off_level=0.005, flux_threshold=0.2, flux_ratio=1.8, confirm_frames=3,
+                 min_duration=0.06):
+        self.on_level = on_level
+        self.off_level = off_level
+        self.flux_threshold = flux_threshold
+        self.flux_ratio = flux_ratio
+        self.flux_average = flux_threshold / flux_ratio
+        self.confirm_frames = confirm_frames
+        self.min_duration = min_duration
+        self.active = None
+        self._sounding = False
+        self._flux_armed = True
+        self._previous = None
+        self._segment = None    # [onset, pitches, cents, peak] of the active note
+        self._candidate = None  # [note, onset, pitches, cents, peak] of a different note seen lately
+
+    def push(self, timestamp, freq, level, magnitude=None):
+        """
+        Feed one frame.
+
+        Parameters:
+            timestamp (float): Frame time in seconds.
+            freq (float): Detected pitch in Hz.
+            level (float): Frame RMS.
+            magnitude (array): Optional magnitude spectrum, enables flux onsets.
+
+        Returns:
+            list: NoteEvents that ended at this frame.
+        """
+        events = []
+        onset = False
+        if magnitude is not None:
+            if self._previous is not None and self._previous.shape == magnitude.shape:
+                flux = spectral_flux(magnitude, self._previous)
+                peak = flux > max(self.flux_threshold, self.flux_ratio * self.flux_average)
+                onset = self._flux_armed and peak
+                self._flux_armed = not peak
+                self.flux_average += 0.1 * (flux - self.flux_average)
+            self._previous = np.array(magnitude, copy=True)
+
+        if self._sounding:
+            self._sounding = level >= self.off_level
+        else:
+            self._sounding = level > self.on_level
+            onset = onset or self._sounding
+        note_index, octave, cents = freq_to_note(freq)
+        note = note_name(note_index, octave) if self._sounding else None
+
+        if note is None:
+            self._close(timestamp, events)
+            self._candidate = None
+        elif self.active is None or onset:
+            self._close(timestamp, events)
+            self._open(note, timestamp, [freq], [cents], level)
+        elif note == self.active:
+            self._candidate = None
+            segment = self._segment
+            segment[1].append(freq)
+            segment[2].append(cents)
+            segment[3] = max(segment[3], level)
+        else:
+            candidate = self._candidate
+            if candidate is None or candidate[0] != note:
+                candidate = self._candidate = [note, timestamp, [], [], 0.0]
+            candidate[2].append(freq)
+            candidate[3].append(cents)
+            candidate[4] = max(candidate[4], level)
+            if len(candidate[2]) >= self.confirm_frames:
+                self._close(candidate[1], events)
+                self._open(*candidate)
+        return events
+
+    def flush(self, timestamp):
+        """End the sounding note, e.g. when the stream stops."""
+        events = []
+        self._close(timestamp, events)
+        return events
+
+    def _open(self, note, onset, pitches, cents, peak):
+        self.active = note
+        self._segment = [onset, list(pitches), list(cents), peak]
+        self._candidate = None
+
+    def _close(self, timestamp, events):
+        if self._segment is not None:
+            onset, pitches, cents, peak = self._segment
+            if timestamp - onset >= self.min_duration:
+                events.append(NoteEvent(self.active, onset, timestamp, float(np.median(pitches)),
+                                        float(np.mean(cents)), float(peak)))
+        self.active = None
+        self._segment = None
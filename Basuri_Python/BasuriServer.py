@@ -0,0 +1,217 @@
+"""
+Headless Basuri pitch server: capture once, publish to every screen.
+
+    python BasuriServer.py                      # serve on 127.0.0.1:5005
+    python BasuriServer.py --engine yin --channels 2
+    python BasuriServer.py --listen             # print what a subscriber receives
+
+One process owns the microphone and runs the detection core (decimation,
+gated detector, note segmentation). Every analysis frame is published as one
+UDP datagram on localhost to all subscribers: a PITCH record per channel plus
+a NOTE record for each note that just ended. Records are fixed-size binary
+structs; the first byte tells them apart.
+
+A subscriber joins by sending b'SUB' to the server and repeats it at least
+every LEASE seconds (subscribe() does this), b'BYE' leaves. UDP gives
+per-client backpressure for free: a subscriber that reads too slowly loses
+datagrams in its own socket buffer, while the server's sends never block
+and the other subscribers are unaffected.
+"""
+import argparse
+import asyncio
+import struct
+import time
+
+import numpy as np
+
+from BasuriNotes import NOTE_NAMES, note_to_midi
+from BasuriPitch import DETECTORS, GatedDetector, make_detector
+from BasuriCapture import AudioCapture, AnalysisWorker
+from BasuriSegment import NoteSegmenter
+
+PORT = 5005
+LEASE = 10.0  # seconds a subscription lasts without a renewal
+
+PITCH = 1
+NOTE = 2
+PITCH_FRAME = struct.Struct('<BBxxdff')   # kind, channel, time, frequency (0 = silent), amplitude
+NOTE_FRAME = struct.Struct('<BBhddfff')   # kind, channel, midi, onset, offset, pitch, cents, peak
+FRAMES = {PITCH: PITCH_FRAME, NOTE: NOTE_FRAME}
+
+
+def pack_pitch(channel, timestamp, freq, amp):
+    return PITCH_FRAME.pack(PITCH, channel, timestamp, freq, amp)
+
+
+def pack_note(channel, event):
+    return NOTE_FRAME.pack(NOTE, channel, note_to_midi(event.note), event.onset, event.offset, event.pitch,
+                           event.cents, event.peak)
+
+
+def unpack(datagram):
+    """Decode one datagram into a list of (kind, fields...) tuples."""
+    records = []
+    offset = 0
+    while offset < len(datagram):
+        frame = FRAMES[datagram[offset]]
+        records.append(frame.unpack_from(datagram, offset))
+        offset += frame.size
+    return records
+
+
+class PitchServer(asyncio.DatagramProtocol):
+    """
+    UDP fan-out of analysis results to the current subscribers.
+
+    publish() may only be called on the event loop; the analysis thread hands
+    datagrams over with loop.call_soon_threadsafe. If the socket itself stops
+    accepting data, datagrams are dropped rather than queued past max_buffer:
+    `sent` counts datagrams per subscriber, `dropped` whole datagrams that
+    went to nobody.
+    """
+
+    def __init__(self, max_buffer=64 * 1024):
+        self.max_buffer = max_buffer
+        self.subscribers = {}  # address -> time of the last SUB
+        self.transport = None
+        self.sent = 0
+        self.dropped = 0
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def datagram_received(self, data, addr):
+        if data == b'SUB':
+            self.subscribers[addr] = time.monotonic()
+        elif data == b'BYE':
+            self.subscribers.pop(addr, None)
+
+    def publish(self, datagram):
+        if self.transport is None or not self.subscribers:
+            return
+        now = time.monotonic()
+        for addr, seen in list(self.subscribers.items()):
+            if now - seen > LEASE:
+                del self.subscribers[addr]
+        # The write buffer belongs to the socket, not to a subscriber: when it is full nobody gets this one
+        if self.transport.get_write_buffer_size() > self.max_buffer:
+            self.dropped += 1
+            return
+        for addr in self.subscribers:
+            self.transport.sendto(datagram, addr)
+            self.sent += 1
+
+
+class PitchPipeline:
+    """
+    Detection core shared by all subscribers: one capture, one detector.
+
+    analyse() runs on the AnalysisWorker thread and turns each frame into one
+    datagram for PitchServer.publish.
+    """
+
+    def __init__(self, publish, engine='fft', channels=1, fs=44100, blocksize=1024, decimate=1):
+        self.publish = publish
+        self.fs = fs // decimate
+        frame_size = blocksize // decimate
+        self.detector = GatedDetector(make_detector(engine), min_size=frame_size // 2)
+        self.segmenters = [NoteSegmenter() for _ in range(channels)]
+        self.capture = AudioCapture(fs=fs, blocksize=blocksize, channels=channels)
+        self.worker = AnalysisWorker(self.capture, frame_size, self.analyse, decimate=decimate)
+
+    def analyse(self, frame, timestamp):
+        freqs, amps = self.detector.detect(frame, self.fs)
+        levels = np.sqrt(np.mean(np.square(frame), axis=-1))
+        magnitude = self.detector.magnitude
+        parts = []
+        for ch, segmenter in enumerate(self.segmenters):
+            parts.append(pack_pitch(ch, timestamp, freqs[ch], amps[ch]))
+            events = segmenter.push(timestamp, freqs[ch], levels[ch], None if magnitude is None else magnitude[ch])
+            parts.extend(pack_note(ch, event) for event in events)
+        self.publish(b''.join(parts))
+
+    def start(self):
+        self.capture.start()
+        self.worker.start()
+
+    def stop(self):
+        self.worker.stop()
+        self.capture.stop()
+
+
+async def serve(host='127.0.0.1', port=PORT, **pipeline_args):
+    loop = asyncio.get_running_loop()
+    transport, server = await loop.create_datagram_endpoint(PitchServer, local_addr=(host, port))
+    pipeline = PitchPipeline(lambda datagram: loop.call_soon_threadsafe(server.publish, datagram), **pipeline_args)
+    pipeline.start()
+    print(f"Serving Basuri pitch on udp://{host}:{port} ({pipeline.detector.name})")
+    try:
+        while True:
+            await asyncio.sleep(LEASE)
+            print(f"{len(server.subscribers)} subscribers, {server.sent} datagrams sent, {server.dropped} dropped")
+    finally:
+        pipeline.stop()
+        transport.close()
+
+
+class _Subscription(asyncio.DatagramProtocol):
+    def __init__(self, queue):
+        self.queue = queue
+
+    def datagram_received(self, data, addr):
+        if self.queue.full():
+            self.queue.get_nowait()  # a slow consumer skips to the newest frames
+        self.queue.put_nowait(data)
+
+
+async def subscribe(host='127.0.0.1', port=PORT, backlog=64):
+    """Async generator of decoded records from a running server; renews the lease itself."""
+    loop = asyncio.get_running_loop()
+    queue = asyncio.Queue(backlog)
+    transport, _ = await loop.create_datagram_endpoint(lambda: _Subscription(queue), remote_addr=(host, port))
+
+    async def renew():
+        while True:
+            transport.sendto(b'SUB')
+            await asyncio.sleep(LEASE / 3)
+
+    renewal = asyncio.ensure_future(renew())
+    try:
+        while True:
+            for record in unpack(await queue.get()):
+                yield record
+    finally:
+        renewal.cancel()
+        transport.sendto(b'BYE')
+        transport.close()
+
+
+async def listen(host='127.0.0.1', port=PORT):
+    async for record in subscribe(host, port):
+        if record[0] == NOTE:
+            _, ch, midi, onset, offset, pitch, cents, peak = record
+            print(f"[mic {ch}] Note: {NOTE_NAMES[midi % 12]}{midi // 12 - 1} for {offset - onset:.2f} s "
+                  f"({pitch:.2f} Hz, {cents:+.0f} cents)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless Basuri pitch server (UDP on localhost).")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=PORT)
+    parser.add_argument('--listen', action='store_true', help="subscribe to a running server and print notes")
+    parser.add_argument('--engine', default='fft', choices=sorted(DETECTORS))
+    parser.add_argument('--channels', type=int, default=1)
+    parser.add_argument('--decimate', type=int, default=1)
+    args = parser.parse_args(argv)
+    try:
+        if args.listen:
+            asyncio.run(listen(args.host, args.port))
+        else:
+            asyncio.run(serve(args.host, args.port, engine=args.engine, channels=args.channels,
+                              decimate=args.decimate))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,268 @@
+"""
+One capture for every Basuri window, shared through shared memory.
+
+    python BasuriShared.py                 # capture daemon, FFT engine
+    python BasuriShared.py --engine yin --channels 2
+
+then start Basuri.py, BasuriPlotter.py or BasuriDetector.py with
+source = 'shared' (BasuriGUI(source='shared')): instead of opening the
+microphone they map the daemon's ring and use the pitch, level and spectrum it
+already computed, so any number of views costs one capture and one FFT per
+block.
+
+The ring is a multiprocessing.shared_memory block: a small int64 header
+followed by `slots` records of slot_dtype(). Every record carries a sequence
+number. The writer marks a slot -1 while it fills it and publishes the
+sequence number afterwards (a seqlock), so a reader can tell whether the
+record it looked at was overwritten meanwhile.
+"""
+import argparse
+import sys
+import threading
+import time
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from BasuriPitch import DETECTORS, STFT, make_detector
+from BasuriCapture import AudioCapture, AnalysisWorker
+
+NAME = 'basuri'
+MAGIC = 0x42415355  # 'BASU'
+# Header fields, int64 each: magic, slots, channels, frame_size, bins, fs, records written
+_MAGIC, _SLOTS, _CHANNELS, _FRAME, _BINS, _FS, _COUNT = range(7)
+HEADER_SIZE = 8 * 8
+
+
+def slot_dtype(channels, frame_size, bins):
+    """One published analysis frame: sequence number, frame time and per-channel results."""
+    return np.dtype([
+        ('seq', '<i8'),
+        ('time', '<f8'),
+        ('frequency', '<f8', (channels,)),
+        ('amplitude', '<f8', (channels,)),
+        ('level', '<f4', (channels,)),
+        ('audio', '<f4', (channels, frame_size)),
+        ('magnitude', '<f4', (channels, bins)),
+    ])
+
+
+def _attach(name):
+    """Open an existing block without handing its lifetime to this process."""
+    try:
+        return shared_memory.SharedMemory(name, track=False)  # Python >= 3.13
+    except TypeError:
+        shm = shared_memory.SharedMemory(name)
+        from multiprocessing import resource_tracker
+        resource_tracker.unregister(shm._name, 'shared_memory')  # otherwise a reader exiting would unlink it
+        return shm
+
+
+def _reclaim(name, wait=0.5, poll=0.05):
+    """
+    Unlink a ring left over from a daemon that did not shut down cleanly.
+
+    The block counts as stale only if its record count does not advance for
+    `wait` seconds; a live daemon publishes every few tens of milliseconds,
+    and its block is left alone (FileExistsError).
+    """
+    shm = _attach(name)
+    try:
+        # Copies, so no view is left on the block when it is closed
+        header = lambda: np.frombuffer(shm.buf, dtype=np.int64, count=HEADER_SIZE // 8).copy()
+        if header()[_MAGIC] != MAGIC:
+            raise ValueError(f"Shared memory block {name!r} exists and is not a Basuri ring")
+        count = header()[_COUNT]
+        deadline = time.monotonic() + wait
+        while time.monotonic() < deadline:
+            time.sleep(poll)
+            if header()[_COUNT] != count:
+                raise FileExistsError(f"A capture daemon is already running on {name!r}")
+    finally:
+        shm.close()
+    shm.unlink()
+
+
+class SharedRing:
+    """
+    Sequence-numbered ring of analysis frames in shared memory.
+
+    The daemon creates it (create=True, single writer); readers attach by name
+    and get the geometry from the header. `header` and `slots` are NumPy views
+    straight onto the shared block.
+    """
+
+    def __init__(self, name=NAME, create=False, slots=64, channels=1, frame_size=512, bins=513, fs=11025):
+        if create:
+            size = HEADER_SIZE + slots * slot_dtype(channels, frame_size, bins).itemsize
+            try:
+                self.shm = shared_memory.SharedMemory(name, create=True, size=size)
+            except FileExistsError:
+                _reclaim(name)
+                self.shm = shared_memory.SharedMemory(name, create=True, size=size)
+            self.header = np.ndarray((HEADER_SIZE // 8,), dtype=np.int64, buffer=self.shm.buf)
+            self.header[:] = 0
+            self.header[[_SLOTS, _CHANNELS, _FRAME, _BINS, _FS]] = slots, channels, frame_size, bins, fs
+            self.header[_MAGIC] = MAGIC
+        else:
+            self.shm = _attach(name)
+            self.header = np.ndarray((HEADER_SIZE // 8,), dtype=np.int64, buffer=self.shm.buf)
+            if self.header[_MAGIC] != MAGIC:
+                raise ValueError(f"Shared memory block {name!r} is not a Basuri ring")
+        self.owner = create
+        self.channels = int(self.header[_CHANNELS])
+        self.frame_size = int(self.header[_FRAME])
+        self.bins = int(self.header[_BINS])
+        self.fs = int(self.header[_FS])
+        dtype = slot_dtype(self.channels, self.frame_size, self.bins)
+        self.slots = np.ndarray((int(self.header[_SLOTS]),), dtype=dtype, buffer=self.shm.buf, offset=HEADER_SIZE)
+        if create:
+            self.slots['seq'] = -1
+
+    @property
+    def count(self):
+        """Records published so far."""
+        return int(self.header[_COUNT])
+
+    def publish(self, timestamp, frequency, amplitude, level, audio, magnitude):
+        seq = int(self.header[_COUNT])
+        slot = self.slots[seq % len(self.slots), ...]  # 0-d view, writes go to shared memory
+        slot['seq'] = -1
+        slot['time'] = timestamp
+        slot['frequency'] = frequency
+        slot['amplitude'] = amplitude
+        slot['level'] = level
+        slot['audio'] = audio
+        slot['magnitude'] = magnitude
+        slot['seq'] = seq
+        self.header[_COUNT] = seq + 1
+
+    def record(self, seq):
+        """
+        Private copy of record seq, or None if it has been overwritten (or is being written).
+
+        The copy is checked against the sequence number afterwards, so a record
+        the writer reached while it was being copied is never handed out, and
+        nothing a caller keeps (e.g. record['time']) changes under it later.
+        """
+        if not self.valid(seq):
+            return None
+        record = self.slots[seq % len(self.slots), ...].copy()
+        return record if self.valid(seq) else None
+
+    def valid(self, seq):
+        """True while record seq is still intact."""
+        return self.slots[seq % len(self.slots)]['seq'] == seq
+
+    def close(self):
+        self.header = self.slots = None
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+
+class SharedWorker(threading.Thread):
+    """
+    Reader thread that calls on_frame(record) for every new record of a ring.
+
+    record is a private copy of the slot (time, frequency, amplitude, level,
+    audio, magnitude per channel), so on_frame may keep any part of it.
+    Records the reader was too slow to see, or that were overwritten while
+    being copied, count in `missed`.
+    """
+
+    def __init__(self, on_frame, name=NAME, poll=0.005):
+        super().__init__(daemon=True)
+        self.ring = SharedRing(name)
+        self.on_frame = on_frame
+        self.poll = poll
+        self.fs = self.ring.fs
+        self.next_seq = self.ring.count
+        self.missed = 0
+        self.running = False
+
+    def run(self):
+        self.running = True
+        ring = self.ring
+        while self.running:
+            count = ring.count
+            if self.next_seq >= count:
+                time.sleep(self.poll)
+                continue
+            oldest = count - len(ring.slots) + 1  # the slot after the newest may be mid-write
+            if self.next_seq < oldest:
+                self.missed += oldest - self.next_seq
+                self.next_seq = oldest
+            seq = self.next_seq
+            self.next_seq += 1
+            record = ring.record(seq)
+            if record is None:
+                self.missed += 1
+                continue
+            self.on_frame(record)
+
+    def stop(self):
+        """Stop and wait for the frame in progress, so its results are in before anything is closed."""
+        self.running = False
+        if self.is_alive() and threading.current_thread() is not self:
+            self.join()
+
+
+class CaptureDaemon:
+    """
+    The one process that owns the microphone.
+
+    Each frame is analysed once: the STFT magnitude is computed and, for the
+    'fft' engine, the pitch is read off that same spectrum; other engines run
+    on the frame as well. Results and the frame itself go into the ring.
+    """
+
+    def __init__(self, engine='fft', channels=1, fs=44100, blocksize=1024, decimate=1, slots=64, name=NAME):
+        self.fs = fs // decimate
+        frame_size = blocksize // decimate
+        self.detector = make_detector(engine)
+        self.stft = STFT(frame_size, self.fs, getattr(self.detector, 'pad', 1))
+        self.ring = SharedRing(name, create=True, slots=slots, channels=channels, frame_size=frame_size,
+                               bins=len(self.stft.freqs), fs=self.fs)
+        self.capture = AudioCapture(fs=fs, blocksize=blocksize, channels=channels)
+        self.worker = AnalysisWorker(self.capture, frame_size, self.analyse, decimate=decimate)
+
+    def analyse(self, frame, timestamp):
+        if self.detector.name == 'fft':
+            freq, amp = self.stft.peak(frame, self.detector.method)
+        else:
+            self.stft.transform(frame)
+            freq, amp = self.detector.detect(frame, self.fs)
+        level = np.sqrt(np.mean(np.square(frame), axis=-1))
+        self.ring.publish(timestamp, freq, amp, level, frame, self.stft.magnitude)
+
+    def run(self):
+        print(f"Capturing into shared memory {self.ring.shm.name!r} ({self.detector.name}); Ctrl-C to stop")
+        try:
+            with self.capture:
+                self.worker.start()
+                while True:
+                    time.sleep(1)
+        except KeyboardInterrupt:
+            self.worker.stop()
+            print("Capture stats:", self.capture.stats())
+        finally:
+            self.ring.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Basuri capture daemon publishing to shared memory.")
+    parser.add_argument('--engine', default='fft', choices=sorted(DETECTORS))
+    parser.add_argument('--channels', type=int, default=1)
+    parser.add_argument('--decimate', type=int, default=1)
+    parser.add_argument('--name', default=NAME, help="shared memory block name")
+    args = parser.parse_args(argv)
+    try:
+        daemon = CaptureDaemon(args.engine, args.channels, decimate=args.decimate, name=args.name)
+    except (FileExistsError, ValueError) as e:
+        sys.exit(e)
+    daemon.run()
+
+
+if __name__ == '__main__':
+    main()
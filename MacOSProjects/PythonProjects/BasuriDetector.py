@@ -1,51 +1,120 @@
+import os
+import sys
+import time
 import numpy as np
-import sounddevice as sd
-from scipy.fft import fft
-
-# Note frequencies for the Western chromatic scale (A4 = 440 Hz)
-NOTE_FREQS = {
-    'C4': 261.63, 'C#4': 277.18, 'D4': 293.66, 'D#4': 311.13, 'E4': 329.63,
-    'F4': 349.23, 'F#4': 369.99, 'G4': 392.00, 'G#4': 415.30, 'A4': 440.00,
-    'A#4': 466.16, 'B4': 493.88, 'C5': 523.25
-}
-
-def freq_to_note(freq):
-    min_diff = float('inf')
-    note = None
-    for n, f in NOTE_FREQS.items():
-        diff = abs(freq - f)
-        if diff < min_diff:
-            min_diff = diff
-            note = n
-    return note
+
+# Shared note lookup lives next to the other Basuri scripts
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'Basuri_Python'))
+from BasuriNotes import freq_to_note_name
+from BasuriPitch import make_detector, GatedDetector
+from BasuriCapture import AudioCapture, AnalysisWorker
+from BasuriSegment import NoteSegmenter
+
 
 def detect_note(audio, fs):
-    # FFT
-    N = len(audio)
-    yf = np.abs(fft(audio))
-    xf = np.fft.fftfreq(N, 1 / fs)
-    # Only look at positive frequencies
-    idx = np.argmax(yf[:N // 2])
-    freq = abs(xf[idx])
-    note = freq_to_note(freq)
+    # audio is one block, or (channels, samples): all channels go through one batched call
+    freq, _ = detector.detect(audio, fs)
+    note = freq_to_note_name(freq)
     return note, freq
 
-def callback(indata, frames, time, status):
-    audio = indata[:, 0]
-    note, freq = detect_note(audio, fs)
-    print(f"Detected Note: {note} (Frequency: {freq:.2f} Hz)")
+def analyse_frame(frame, timestamp):
+    # Runs on the analysis worker, so printing cannot stall the audio callback
+    if channels == 1:
+        # A single flute takes the detectors' 1-D path, several times cheaper than a batch of one
+        audio = frame[0]
+        note, freq = detect_note(audio, analysis_fs)
+        level = np.sqrt(np.dot(audio, audio) / len(audio))
+        magnitude = detector.magnitude
+        report(timestamp, [note], [freq], [level], None if magnitude is None else magnitude[None])
+        return
+    notes, freqs = detect_note(frame, analysis_fs)
+    levels = np.sqrt(np.mean(np.square(frame), axis=-1))
+    report(timestamp, notes, freqs, levels, detector.magnitude)
+
+def analyse_shared(record):
+    # Pitch, level and spectrum were already computed by the capture daemon (BasuriShared.py)
+    freqs, levels = record['frequency'], record['level']
+    notes = np.where(levels >= detector.gate_level, freq_to_note_name(freqs), None)
+    report(float(record['time']), notes, freqs, levels, record['magnitude'])
+
+def report(timestamp, notes, freqs, levels, magnitude):
+    if mode == 'frames':
+        if not any(notes):
+            return  # silence, skipped by the gate
+        if channels == 1:
+            print(f"Detected Note: {notes[0]} (Frequency: {freqs[0]:.2f} Hz)")
+        else:
+            # One note stream per microphone
+            print("  ".join(f"[mic {ch}] {note} ({freq:.2f} Hz)" for ch, (note, freq) in enumerate(zip(notes, freqs))))
+        return
+    for ch, segmenter in enumerate(segmenters):
+        for event in segmenter.push(timestamp, freqs[ch], levels[ch], None if magnitude is None else magnitude[ch]):
+            print_event(event, ch)
+
+def print_event(event, ch):
+    prefix = f"[mic {ch}] " if channels > 1 else ""
+    start = time.strftime('%H:%M:%S', time.localtime(event.onset))
+    print(f"{prefix}{start} Note: {event.note} for {event.offset - event.onset:.2f} s "
+          f"({event.pitch:.2f} Hz, {event.cents:+.0f} cents, peak {event.peak:.3f})")
 
 # Parameters
 # duration = 2  # seconds per analysis
-duration = 0.25  # seconds per analysis
+# duration = 0.25  # seconds per analysis
 fs = 44100    # sampling rate
+channels = 1  # microphones to capture; set to the ensemble size, e.g. 8
+mode = 'events'  # 'events': one line per played note, 'frames': one line per analysis frame
+source = 'mic'  # 'mic', or 'shared' to read the BasuriShared.py capture daemon instead
+blocksize = 1024  # ~23 ms, interpolation keeps the pitch cent-accurate
+duration = blocksize / fs  # seconds per analysis
+decimate = 1  # e.g. 4 to analyse at 11.025 kHz; not cheaper than 44.1 kHz for the fft engine
+analysis_fs = fs // decimate
+frame_size = blocksize // decimate  # one block per frame
+engine = 'fft'  # pitch engine: 'fft' (strongest bin), 'yin', 'acf' or 'goertzel' (bank at the ladder notes)
+detector = GatedDetector(make_detector(engine), min_size=frame_size // 2)  # silent blocks skip pitch estimation, fast passages use half a block
+segmenters = [NoteSegmenter() for _ in range(channels)]
 
-print("Listening... Play a note on your Basuri.")
-
-with sd.InputStream(callback=callback, channels=1, samplerate=fs, blocksize=int(fs * duration)):
-    while True:
-        sd.sleep(int(duration * 1000))
+def configure(**params):
+    # Override the parameters above (e.g. from BasuriCLI.py) and rebuild what depends on them
+    global analysis_fs, frame_size, detector, segmenters
+    globals().update(params)
+    analysis_fs = fs // decimate
+    frame_size = blocksize // decimate
+    detector = GatedDetector(make_detector(engine), min_size=frame_size // 2)
+    segmenters = [NoteSegmenter() for _ in range(channels)]
 
+def main():
+    print("Listening... Play a note on your Basuri.")
 
+    if source == 'shared':
+        from BasuriShared import SharedWorker  # multiprocessing is only worth importing here
+        worker = SharedWorker(analyse_shared)
+        if worker.ring.channels != channels:
+            sys.exit(f"The capture daemon records {worker.ring.channels} channels; set channels to match")
+        capture = None
+    else:
+        capture = AudioCapture(fs=fs, blocksize=blocksize, channels=channels)
+        worker = AnalysisWorker(capture, frame_size, analyse_frame, decimate=decimate)
 
+    try:
+        if capture is not None:
+            capture.start()
+        worker.start()
+        while True:
+            time.sleep(0.5)
+    except KeyboardInterrupt:
+        worker.stop()
+        for ch, segmenter in enumerate(segmenters):
+            for event in segmenter.flush(time.time()):
+                print_event(event, ch)
+        if capture is not None:
+            print(f"{detector.name}: {detector.cost_per_frame * 1000:.3f} ms per frame over {detector.frames} frames, "
+                  f"{detector.skipped} skipped as silence")
+            print("Capture stats:", capture.stats())
+        else:
+            print(f"Shared ring: {worker.missed} frames missed")
+    finally:
+        if capture is not None:
+            capture.stop()
 
+if __name__ == "__main__":
+    main()
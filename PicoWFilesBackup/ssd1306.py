@@ -37,7 +37,7 @@ class SSD1306(framebuf.FrameBuffer):
         self.init_display()
 
     def init_display(self):
-        for cmd in (
+        self.write_cmds(bytes((
             SET_DISP,  # display off
             # address setting
             SET_MEM_ADDR,
@@ -70,8 +70,7 @@ class SSD1306(framebuf.FrameBuffer):
             SET_CHARGE_PUMP,
             0x10 if self.external_vcc else 0x14,
             SET_DISP | 0x01,  # display on
-        ):  # on
-            self.write_cmd(cmd)
+        )))  # whole sequence in one transaction
         self.fill(0)
         self.show()
 
@@ -82,15 +81,13 @@ class SSD1306(framebuf.FrameBuffer):
         self.write_cmd(SET_DISP | 0x01)
 
     def contrast(self, contrast):
-        self.write_cmd(SET_CONTRAST)
-        self.write_cmd(contrast)
+        self.write_cmds(bytes((SET_CONTRAST, contrast)))
 
     def invert(self, invert):
         self.write_cmd(SET_NORM_INV | (invert & 1))
 
     def rotate(self, rotate):
-        self.write_cmd(SET_COM_OUT_DIR | ((rotate & 1) << 3))
-        self.write_cmd(SET_SEG_REMAP | (rotate & 1))
+        self.write_cmds(bytes((SET_COM_OUT_DIR | ((rotate & 1) << 3), SET_SEG_REMAP | (rotate & 1))))
 
     def show(self):
         x0 = 0
@@ -100,20 +97,21 @@ class SSD1306(framebuf.FrameBuffer):
             col_offset = (128 - self.width) // 2
             x0 += col_offset
             x1 += col_offset
-        self.write_cmd(SET_COL_ADDR)
-        self.write_cmd(x0)
-        self.write_cmd(x1)
-        self.write_cmd(SET_PAGE_ADDR)
-        self.write_cmd(0)
-        self.write_cmd(self.pages - 1)
+        self.write_cmds(bytes((SET_COL_ADDR, x0, x1, SET_PAGE_ADDR, 0, self.pages - 1)))
         self.write_data(self.buffer)
 
+    def write_cmds(self, cmds):
+        # fallback for interfaces without a batched command write
+        for cmd in cmds:
+            self.write_cmd(cmd)
+
 
 class SSD1306_I2C(SSD1306):
     def __init__(self, width, height, i2c, addr=0x3C, external_vcc=False):
         self.i2c = i2c
         self.addr = addr
         self.temp = bytearray(2)
+        self.cmd_list = [b"\x00", None]  # Co=0, D/C#=0
         self.write_list = [b"\x40", None]  # Co=0, D/C#=1
         super().__init__(width, height, external_vcc)
 
@@ -122,6 +120,11 @@ class SSD1306_I2C(SSD1306):
         self.temp[1] = cmd
         self.i2c.writeto(self.addr, self.temp)
 
+    def write_cmds(self, cmds):
+        # all command bytes in one transaction after a single control byte
+        self.cmd_list[1] = cmds
+        self.i2c.writevto(self.addr, self.cmd_list)
+
     def write_data(self, buf):
         self.write_list[1] = buf
         self.i2c.writevto(self.addr, self.write_list)
@@ -154,6 +157,14 @@ class SSD1306_SPI(SSD1306):
         self.spi.write(bytearray([cmd]))
         self.cs(1)
 
+    def write_cmds(self, cmds):
+        self.spi.init(baudrate=self.rate, polarity=0, phase=0)
+        self.cs(1)
+        self.dc(0)
+        self.cs(0)
+        self.spi.write(cmds)
+        self.cs(1)
+
     def write_data(self, buf):
         self.spi.init(baudrate=self.rate, polarity=0, phase=0)
         self.cs(1)
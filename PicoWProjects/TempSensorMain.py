@@ -33,6 +33,78 @@ network_connection = False
 display.invert(0) # 0 -> White text on Black BG, 1 -> Black text on White BG
 display.contrast(100) # 0 = min, 100 = max
 
+# Set when the frame buffer holds a new frame; display_task sends it
+display_ready = asyncio.Event()
+
+class Screen:
+    """
+    Dashboard with a static layer and fixed-size text fields.
+
+    Labels and other constant graphics are drawn once into a background
+    FrameBuffer and blitted onto the display by draw_background(). Fields are
+    cells of 8x8 characters; update() redraws only the characters whose value
+    changed, so together with show()'s partial transfers a new reading costs
+    a few characters of CPU and bus time. Fields are cleared to black, so
+    they must not overlap the background.
+    """
+    CHAR = 8  # framebuf font cell size in pixels
+
+    def __init__(self, display):
+        self.display = display
+        self.background = framebuf.FrameBuffer(bytearray(len(display.buffer)), display.width, display.height,
+                                               framebuf.MONO_VLSB)
+        self.fields = {}
+
+    def label(self, text, x, y):
+        self.background.text(text, x, y, 1)
+
+    def field(self, name, x, y, chars):
+        """
+        Register a text field.
+
+        :param name: Key used with update()
+        :param x, y: Top-left pixel of the field
+        :param chars: Field width in characters; longer values are cut off
+        """
+        self.fields[name] = [x, y, " " * chars]
+
+    def draw_background(self):
+        self.display.blit(self.background, 0, 0)
+        for field in self.fields.values():
+            field[2] = " " * len(field[2])
+
+    def update(self, name, value):
+        """
+        Show value in a field, redrawing only the characters that differ.
+
+        :return: True if anything was drawn
+        """
+        field = self.fields[name]
+        x, y, shown = field
+        chars = len(shown)
+        value = (value + " " * chars)[:chars]
+        changed = False
+        for i in range(chars):
+            if value[i] != shown[i]:
+                self.display.fill_rect(x + i * self.CHAR, y, self.CHAR, self.CHAR, 0)
+                self.display.text(value[i], x + i * self.CHAR, y, 1)
+                changed = True
+        field[2] = value
+        return changed
+
+screen = Screen(display)
+screen.label("Temperature:", 0, 0)
+screen.label("C: ", 0, 11)
+screen.label("F: ", 0, 21)
+screen.label("Date: ", 0, 31)
+screen.label("Time: ", 0, 41)
+screen.label("Server: ", 0, 51)
+screen.field("celsius", 24, 11, 6)
+screen.field("fahrenheit", 24, 21, 6)
+screen.field("date", 48, 31, 10)
+screen.field("time", 48, 41, 8)
+screen.field("server", 64, 51, 7)
+
 # Temperature Configurations
 def get_temp():
     sensor_temp = machine.ADC(4)
@@ -80,17 +152,33 @@ def display_welcome_text():
     time.sleep(3)
 
 def display_temp(temperatures, date_time_texts):
-    display.text("Temperature:", 0,0)
-    display.text("C: " + temperatures[0],0,11)
-    display.text("F: " + temperatures[-1],0,21)
-    display.text("Date: " + date_time_texts[0], 0, 31)
-    display.text("Time: " + date_time_texts[-1], 0, 41)
-    display.text("Server: " + "running" if network_connection else "Server: " + "failed", 0, 51)
-    
-    display.show()
-    display.fill(0)
+    # Labels are in the screen's background; only changed characters are redrawn
+    changed = screen.update("celsius", temperatures[0])
+    changed |= screen.update("fahrenheit", temperatures[-1])
+    changed |= screen.update("date", date_time_texts[0])
+    changed |= screen.update("time", date_time_texts[-1])
+    changed |= screen.update("server", "running" if network_connection else "failed")
     
-    time.sleep(0.5)
+    # Sending is left to display_task so the event loop is not blocked
+    if changed:
+        display_ready.set()
+
+async def display_task():
+    """
+    Push new frames to the display without stalling the web server.
+
+    Drawing code sets display_ready when a frame is complete. Each flush sends
+    the changed part of one page per I2C transfer and yields to the event loop
+    between pages, so HTTP clients wait at most one page transfer (~3 ms).
+    Frames finished while a flush is running are coalesced: the flag is set
+    again and the next pass sends only what still differs from the display.
+    """
+    while True:
+        await display_ready.wait()
+        display_ready.clear()
+        for page in range(display.pages):
+            display.show_page(page)
+            await asyncio.sleep(0)
 
 # Init Wi-Fi Interface
 def init_wifi(ssid, password):
@@ -159,6 +247,7 @@ async def handle_client(reader, writer):
     
     
 async def temperature_task():
+    screen.draw_background()
     while True:
         global temperature
         global date_time
@@ -174,6 +263,7 @@ async def temperature_task():
 async def main():
     global network_connection 
     
+    asyncio.create_task(display_task())
     asyncio.create_task(temperature_task())    
     
     connection = init_wifi(ssid, password)
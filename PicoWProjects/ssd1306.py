@@ -40,6 +40,10 @@ class SSD1306:
         self.external_vcc = external_vcc
         self.pages = height // 8
         self.buffer = bytearray(self.pages * self.width)
+        # What the display RAM holds, so show() only sends what changed since
+        self.shadow = bytearray(self.pages * self.width)
+        # SET_COL_ADDR x0 x1 SET_PAGE_ADDR page0 page1, reused for every window
+        self.window_cmds = bytearray((SET_COL_ADDR, 0, 0, SET_PAGE_ADDR, 0, 0))
         self.framebuf = framebuf.FrameBuffer(self.buffer, self.width, self.height, framebuf.MONO_VLSB)
 
         # Graphics functions with docstrings
@@ -153,7 +157,7 @@ class SSD1306:
         """
         Initialize the display settings and configuration.
         """
-        for cmd in (
+        self.write_cmds(bytes((
             SET_DISP | 0x00,  # Display off
             SET_MEM_ADDR, 0x00,  # Horizontal addressing mode
             SET_DISP_START_LINE | 0x00,  # Start line at 0
@@ -170,10 +174,9 @@ class SSD1306:
             SET_NORM_INV,  # Not inverted
             SET_CHARGE_PUMP, 0x10 if self.external_vcc else 0x14,  # Charge pump
             SET_DISP | 0x01  # Display on
-        ):
-            self.write_cmd(cmd)
+        )))
         self.fill(0)
-        self.show()
+        self.show(full=True)  # The display RAM is undefined after power-up
 
     def poweroff(self):
         """
@@ -194,8 +197,7 @@ class SSD1306:
         Parameters:
             contrast (int): The contrast value (0-255).
         """
-        self.write_cmd(SET_CONTRAST)
-        self.write_cmd(contrast)
+        self.write_cmds(bytes((SET_CONTRAST, contrast)))
 
     def invert(self, invert):
         """
@@ -213,25 +215,99 @@ class SSD1306:
         Parameters:
             rotate (bool): Whether to rotate the display (True or False).
         """
-        self.write_cmd(SET_COM_OUT_DIR | ((rotate & 1) << 3))
-        self.write_cmd(SET_SEG_REMAP | (rotate & 1))
+        self.write_cmds(bytes((SET_COM_OUT_DIR | ((rotate & 1) << 3), SET_SEG_REMAP | (rotate & 1))))
 
-    def show(self):
+    def show(self, full=False):
         """
         Update the display with the current buffer content.
+
+        Only what changed since the last update is sent: the buffer is
+        compared with a shadow copy of the display RAM, and for every page
+        (8-pixel row) that differs just the columns from its first to its
+        last changed byte are written, through a SET_COL_ADDR/SET_PAGE_ADDR
+        window. Redrawing a few characters of a clock costs a few dozen bytes
+        on the bus instead of the whole 1 KB frame.
+
+        Parameters:
+            full (bool): Send the whole frame regardless (default is False).
+
+        Returns:
+            int: Number of data bytes sent.
+        """
+        if full:
+            self._set_window(0, self.width - 1, 0, self.pages - 1)
+            self.write_data(self.buffer)
+            self.shadow[:] = self.buffer
+            return len(self.buffer)
+        sent = 0
+        for page in range(self.pages):
+            sent += self.show_page(page)
+        return sent
+
+    def show_page(self, page):
+        """
+        Send the changed columns of one page to the display.
+
+        Parameters:
+            page (int): The page (rows 8 * page to 8 * page + 7) to update.
+
+        Returns:
+            int: Number of data bytes sent, 0 if the page was unchanged.
+        """
+        start = page * self.width
+        columns = self._changed_columns(start)
+        if columns is None:
+            return 0
+        first, last = columns
+        self._set_window(first, last, page, page)
+        self.write_data(memoryview(self.buffer)[start + first:start + last + 1])
+        self.shadow[start + first:start + last + 1] = self.buffer[start + first:start + last + 1]
+        return last - first + 1
+
+    def _changed_columns(self, start):
+        """
+        Find the changed columns of the page that starts at buffer offset start.
+
+        Slices are compared 8 bytes at a time from both ends, then byte by
+        byte, so an unchanged page costs a single comparison.
+
+        Returns:
+            tuple: (first, last) changed column, or None if the page is unchanged.
+        """
+        buffer = self.buffer
+        shadow = self.shadow
+        end = start + self.width
+        if buffer[start:end] == shadow[start:end]:
+            return None
+        first = start
+        while buffer[first:first + 8] == shadow[first:first + 8]:
+            first += 8
+        while buffer[first] == shadow[first]:
+            first += 1
+        last = end
+        while buffer[last - 8:last] == shadow[last - 8:last]:
+            last -= 8
+        while buffer[last - 1] == shadow[last - 1]:
+            last -= 1
+        return first - start, last - 1 - start
+
+    def _set_window(self, x0, x1, page0, page1):
+        """
+        Set the column and page range that the following data bytes fill.
+
+        Parameters:
+            x0, x1 (int): First and last column.
+            page0, page1 (int): First and last page.
         """
-        x0 = 0
-        x1 = self.width - 1
         if self.width == 64:  # 64-pixel wide displays are shifted by 32
             x0 += 32
             x1 += 32
-        self.write_cmd(SET_COL_ADDR)
-        self.write_cmd(x0)
-        self.write_cmd(x1)
-        self.write_cmd(SET_PAGE_ADDR)
-        self.write_cmd(0)
-        self.write_cmd(self.pages - 1)
-        self.write_data(self.buffer)
+        cmds = self.window_cmds
+        cmds[1] = x0
+        cmds[2] = x1
+        cmds[4] = page0
+        cmds[5] = page1
+        self.write_cmds(cmds)
     
     def triangle(self, x0, y0, x1, y1, x2, y2, color, fill=False):
         """
@@ -245,49 +321,97 @@ class SSD1306:
             fill (bool): Whether to fill the triangle (default is False, i.e., outline only).
         """
         if fill:
-            # Fill the triangle using a simple scan-line fill algorithm
-            # Find the bounding box of the triangle
-            min_x = min(x0, x1, x2)
-            max_x = max(x0, x1, x2)
-            min_y = min(y0, y1, y2)
-            max_y = max(y0, y1, y2)
-
-            for y in range(min_y, max_y + 1):
-                # Find the x-coordinates where the scan line crosses the edges of the triangle
-                crossings = []
-                if (y0 <= y <= y1) or (y1 <= y <= y0):
-                    crossings.append(self._get_intersection(x0, y0, x1, y1, y))
-                if (y1 <= y <= y2) or (y2 <= y <= y1):
-                    crossings.append(self._get_intersection(x1, y1, x2, y2, y))
-                if (y0 <= y <= y2) or (y2 <= y <= y0):
-                    crossings.append(self._get_intersection(x0, y0, x2, y2, y))
-
-                # Sort the x-coordinates and fill between the intersections
-                crossings.sort()
-                for x in range(crossings[0], crossings[1] + 1):
-                    self.pixel(x, y, color)
-        else:
-            # Draw the outline of the triangle
-            self.line(x0, y0, x1, y1, color)
-            self.line(x1, y1, x2, y2, color)
-            self.line(x2, y2, x0, y0, color)
-            
-    def _get_intersection(self, x0, y0, x1, y1, y):
+            # Fill the triangle with one horizontal span per scanline
+            self._fill_polygon(((x0, y0), (x1, y1), (x2, y2)), color)
+        # Draw the outline of the triangle (for a filled one it covers the edge pixels)
+        self.line(x0, y0, x1, y1, color)
+        self.line(x1, y1, x2, y2, color)
+        self.line(x2, y2, x0, y0, color)
+
+    def _fill_polygon(self, points, color):
         """
-        Helper function to find the intersection point between a line and a horizontal scanline at a given y-coordinate.
+        Fill a polygon with horizontal spans (scanline fill with integer edge stepping).
 
-        Parameters:
-            x0, y0 (int): The first point of the line.
-            x1, y1 (int): The second point of the line.
-            y (int): The y-coordinate of the horizontal line.
+        Every non-horizontal edge becomes an edge record whose x is stepped down
+        one scanline at a time with an integer error term (Bresenham style), so
+        no division or float maths happens per row. The crossings of each row
+        are paired up even-odd and every pair is drawn with one native hline.
+        Edges cover rows y_top <= y < y_bottom, so shared vertices are counted
+        once; the outline drawn by the callers covers the bottom row.
 
-        Returns:
-            int: The x-coordinate where the line intersects the scanline.
+        Parameters:
+            points (list of tuples): (x, y) vertices of the polygon, in drawing order.
+            color (int): The fill color (0 for off, 1 for on).
         """
-        if y1 == y0:  # Horizontal line
-            return min(x0, x1)
-        # Linear interpolation to find the x-coordinate of the intersection
-        return int(x0 + (x1 - x0) * (y - y0) / (y1 - y0))
+        edges = []
+        num_points = len(points)
+        for i in range(num_points):
+            x0, y0 = points[i]
+            x1, y1 = points[(i + 1) % num_points]  # Wrap around to the first point
+            if y0 == y1:
+                continue  # Horizontal edges never cross a scanline
+            if y0 > y1:
+                x0, y0, x1, y1 = x1, y1, x0, y0
+            dy = y1 - y0
+            step, remainder = divmod(x1 - x0, dy)  # Whole and fractional x movement per row
+            # [top y, bottom y, x, step, remainder, dy, error]
+            edges.append([y0, y1, x0, step, remainder, dy, 0])
+        if not edges:
+            return
+        edges.sort()
+
+        hline = self.hline
+        y = edges[0][0]
+        bottom = min(max(edge[1] for edge in edges), self.height)
+        active = []
+        next_edge = 0
+        while y < bottom:
+            # Add edges starting on this row, drop the ones that ended above it
+            while next_edge < len(edges) and edges[next_edge][0] == y:
+                active.append(edges[next_edge])
+                next_edge += 1
+            active = [edge for edge in active if edge[1] > y]
+
+            if y >= 0:
+                # x is the floor of the exact crossing; round towards zero like int() for negative ones
+                crossings = sorted([edge[2] + 1 if edge[2] < 0 and edge[6] else edge[2] for edge in active])
+                for i in range(0, len(crossings) - 1, 2):
+                    hline(crossings[i], y, crossings[i + 1] - crossings[i] + 1, color)
+
+            # Step every active edge down to the next row
+            for edge in active:
+                edge[2] += edge[3]
+                edge[6] += edge[4]
+                if edge[6] >= edge[5]:
+                    edge[2] += 1
+                    edge[6] -= edge[5]
+            y += 1
+
+    def _fill_ellipse(self, cx, cy, rx, ry, color):
+        """
+        Fill an axis-aligned ellipse with one horizontal span per scanline.
+
+        Going out from the centre row, the half-width dx only ever shrinks, so
+        it is found by stepping it down while (dx, dy) lies outside the
+        ellipse, using integers only: at most rx steps for the whole shape.
+
+        Parameters:
+            cx, cy (int): The center coordinates of the ellipse.
+            rx, ry (int): The horizontal and vertical radii.
+            color (int): The fill color (0 for off, 1 for on).
+        """
+        hline = self.hline
+        rx2 = rx * rx
+        ry2 = ry * ry
+        limit = rx2 * ry2
+        dx = rx
+        hline(cx - rx, cy, 2 * rx + 1, color)
+        for dy in range(1, ry + 1):
+            row = dy * dy * rx2
+            while dx > 0 and dx * dx * ry2 + row > limit:
+                dx -= 1
+            hline(cx - dx, cy - dy, 2 * dx + 1, color)
+            hline(cx - dx, cy + dy, 2 * dx + 1, color)
     
     def circle(self, cx, cy, r, color, fill=False):
         """
@@ -300,11 +424,8 @@ class SSD1306:
             fill (bool): Whether to fill the circle (default is False, i.e., outline only).
         """
         if fill:
-            # Fill the circle
-            for y in range(cy - r, cy + r + 1):
-                dx = int((r ** 2 - (y - cy) ** 2) ** 0.5)
-                for x in range(cx - dx, cx + dx + 1):
-                    self.pixel(x, y, color)
+            # Fill the circle with one horizontal span per scanline
+            self._fill_ellipse(cx, cy, r, r, color)
         else:
             # Outline the circle (Bresenham's Circle Algorithm)
             x = 0
@@ -348,34 +469,8 @@ class SSD1306:
             self.line(x0, y0, x1, y1, color)
 
         if fill:
-            # Fill the polygon using the scanline algorithm
-            # Find the minimum and maximum Y values in the polygon
-            min_y = min(points, key=lambda p: p[1])[1]
-            max_y = max(points, key=lambda p: p[1])[1]
-
-            # For each Y level, find the intersection points
-            for y in range(min_y, max_y + 1):
-                intersections = []
-                for i in range(num_points):
-                    x0, y0 = points[i]
-                    x1, y1 = points[(i + 1) % num_points]  # Wrap around to the first point
-
-                    # Check if the horizontal line at Y intersects the line segment
-                    if (y0 <= y < y1) or (y1 <= y < y0):  # Check if the horizontal line crosses the segment
-                        # Find the intersection point using the equation of the line
-                        x_intersection = x0 + (y - y0) * (x1 - x0) / (y1 - y0)
-                        intersections.append(int(x_intersection))
-
-                # Sort the intersection points
-                intersections.sort()
-
-                # Fill between pairs of intersection points
-                for i in range(0, len(intersections), 2):
-                    x_start = intersections[i]
-                    x_end = intersections[i + 1]
-                    # Draw the horizontal line between the intersection points
-                    for x in range(x_start, x_end + 1):
-                        self.pixel(x, y, color)
+            # Fill the polygon with horizontal spans between edge crossings
+            self._fill_polygon(points, color)
     
     def parallelogram(self, x1, y1, x2, y2, dx1, dy1, dx2, dy2, color, fill=False):
         """
@@ -400,36 +495,9 @@ class SSD1306:
         self.line(x3, y3, x1, y1, color)  # Fourth side
 
         if fill:
-            # Fill the parallelogram using a scanline algorithm
-            # Find the bounding box of the parallelogram
-            min_y = min(y1, y2, y3, y4)
-            max_y = max(y1, y2, y3, y4)
-
-            for y in range(min_y, max_y + 1):
-                intersections = []
-
-                # Find intersections with the parallelogram's edges
-                self._find_intersections(x1, y1, x2, y2, y, intersections)
-                self._find_intersections(x2, y2, x4, y4, y, intersections)
-                self._find_intersections(x4, y4, x3, y3, y, intersections)
-                self._find_intersections(x3, y3, x1, y1, y, intersections)
-
-                # Remove duplicate intersections
-                intersections = list(set(intersections))
-
-                # Sort the intersection points
-                intersections.sort()
-
-                # Fill between pairs of intersection points
-                for i in range(0, len(intersections), 2):
-                    if i + 1 < len(intersections):  # Ensure there is a pair
-                        x_start = intersections[i]
-                        x_end = intersections[i + 1]
-                        # Draw the horizontal line between the intersection points
-                        for x in range(x_start, x_end + 1):
-                            self.pixel(x, y, color)
+            # Fill the parallelogram with horizontal spans between edge crossings
+            self._fill_polygon(((x1, y1), (x2, y2), (x4, y4), (x3, y3)), color)
 
-    
     def trapezium(self, x1, y1, x2, y2, x3, y3, x4, y4, color, fill=False):
         """
         Draw a trapezium defined by four points.
@@ -449,29 +517,8 @@ class SSD1306:
         self.line(x4, y4, x1, y1, color)  # Left side
 
         if fill:
-            # Fill the trapezium using a scanline algorithm
-            min_y = min(y1, y2, y3, y4)
-            max_y = max(y1, y2, y3, y4)
-
-            for y in range(min_y, max_y + 1):
-                intersections = []
-
-                # Find intersections with the trapezium's edges
-                self._find_intersections(x1, y1, x2, y2, x3, y3, y, intersections)
-                self._find_intersections(x2, y2, x3, y3, x4, y4, y, intersections)
-                self._find_intersections(x3, y3, x4, y4, x1, y1, y, intersections)
-                self._find_intersections(x4, y4, x1, y1, x2, y2, y, intersections)
-
-                # Sort the intersection points
-                intersections.sort()
-
-                # Fill between pairs of intersection points
-                for i in range(0, len(intersections), 2):
-                    x_start = intersections[i]
-                    x_end = intersections[i + 1]
-                    # Draw the horizontal line between the intersection points
-                    for x in range(x_start, x_end + 1):
-                        self.pixel(x, y, color)
+            # Fill the trapezium with horizontal spans between edge crossings
+            self._fill_polygon(((x1, y1), (x2, y2), (x3, y3), (x4, y4)), color)
     
     def ellipse(self, cx, cy, rx, ry, color, fill=False):
         """
@@ -485,11 +532,8 @@ class SSD1306:
             fill (bool): Whether to fill the ellipse (default is False, i.e., outline only).
         """
         if fill:
-            # Fill the ellipse using the parametric equation
-            for y in range(cy - ry, cy + ry + 1):
-                dx = int(rx * (1 - ((y - cy) ** 2 / ry ** 2)) ** 0.5)
-                for x in range(cx - dx, cx + dx + 1):
-                    self.pixel(x, y, color)
+            # Fill the ellipse with one horizontal span per scanline
+            self._fill_ellipse(cx, cy, rx, ry, color)
         else:
             # Outline the ellipse (using a midpoint ellipse algorithm)
             x = 0
@@ -531,22 +575,7 @@ class SSD1306:
                     dx += 2 * ry * ry
                     p2 += dx - dy + rx * rx
 
-    
-    def _find_intersections(self, x1, y1, x2, y2, dx, dy, y, intersections):
-        """
-        Find the intersection of the line (x1, y1) -> (x2, y2) with the horizontal line at y.
-        
-        Parameters:
-            x1, y1 (int): Start coordinates of the line segment.
-            x2, y2 (int): End coordinates of the line segment.
-            dx, dy (int): Direction vector of the line segment.
-            y (int): The Y-coordinate of the horizontal line.
-            intersections (list): List to store the X-coordinate of the intersection.
-        """
-        if (y1 <= y < y2) or (y2 <= y < y1):  # Check if the horizontal line crosses the segment
-            x_intersection = x1 + (y - y1) * (x2 - x1) / (y2 - y1)
-            intersections.append(int(x_intersection))
-            
+
     def round_rect(self, x, y, w, h, color, filled=False, radius=0):
         """
         Draw a rectangle with optional rounded corners.
@@ -602,6 +631,19 @@ class SSD1306:
     def write_cmd(self, cmd):
         raise NotImplementedError
 
+    def write_cmds(self, cmds):
+        """
+        Write a sequence of command bytes (with their arguments) to the display.
+
+        Subclasses send the whole sequence in one bus transaction; this
+        fallback sends the bytes one by one.
+
+        Parameters:
+            cmds (bytes): The command bytes to send.
+        """
+        for cmd in cmds:
+            self.write_cmd(cmd)
+
     def write_data(self, buf):
         raise NotImplementedError
 
@@ -621,6 +663,8 @@ class SSD1306_I2C(SSD1306):
         self.i2c = i2c
         self.addr = addr
         self.temp = bytearray(2)
+        self.cmd_list = [b"\x00", None]  # Co=0, D/C#=0: all following bytes are commands
+        self.write_list = [b"\x40", None]  # Co=0, D/C#=1: all following bytes are data
         super().__init__(width, height, external_vcc)
 
     def write_cmd(self, cmd):
@@ -634,14 +678,28 @@ class SSD1306_I2C(SSD1306):
         self.temp[1] = cmd
         self.i2c.writeto(self.addr, self.temp)
 
+    def write_cmds(self, cmds):
+        """
+        Write a command sequence to the display in a single I2C transaction.
+
+        Parameters:
+            cmds (bytes): The command bytes to send.
+        """
+        self.cmd_list[1] = cmds
+        self.i2c.writevto(self.addr, self.cmd_list)
+
     def write_data(self, buf):
         """
         Write data to the display over I2C.
 
+        The control byte and buf go out as one transaction without copying
+        buf, so a memoryview of part of the frame buffer can be passed.
+
         Parameters:
             buf (bytearray): The data to send to the display.
         """
-        self.i2c.writeto_mem(self.addr, 0x40, buf)
+        self.write_list[1] = buf
+        self.i2c.writevto(self.addr, self.write_list)
 
 
 class SSD1306_SPI(SSD1306):
@@ -682,6 +740,20 @@ class SSD1306_SPI(SSD1306):
         self.spi.write(bytearray([cmd]))
         self.cs.high()
 
+    def write_cmds(self, cmds):
+        """
+        Write a command sequence to the display in a single SPI transfer.
+
+        Parameters:
+            cmds (bytes): The command bytes to send.
+        """
+        self.spi.init(baudrate=self.rate, polarity=0, phase=0)
+        self.cs.high()
+        self.dc.low()
+        self.cs.low()
+        self.spi.write(cmds)
+        self.cs.high()
+
     def write_data(self, buf):
         """
         Write data to the display over SPI.